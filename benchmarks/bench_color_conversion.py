@@ -0,0 +1,70 @@
+"""Micro-benchmark of the batch hex/RGB kernels against the per-color implementations.
+
+Usage:
+    python benchmarks/bench_color_conversion.py [--n N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+# Run from a checkout without installing plotfair
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plotfair.colors import hexes_to_rgb, rgb_to_hex, rgb_to_strings
+
+
+def legacy_hex_to_rgb(hex_code):
+    """The per-color implementation hexes_to_rgb replaces."""
+    hex_clean = hex_code.lstrip("#")
+    return tuple(int(hex_clean[i:i+2], 16)/255 for i in (0, 2, 4))
+
+
+def legacy_floats_to_rgbstring(color_float):
+    """The per-color implementation rgb_to_strings replaces."""
+    return f"rgb({int(color_float[0]*255)}, {int(color_float[1]*255)}, {int(color_float[2]*255)})"
+
+
+def legacy_rgb_to_hex(color_float):
+    return "#" + "".join(f"{round(c * 255):02X}" for c in color_float)
+
+
+def best_of(fn, repeat=5):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    hexes = [f"#{v:06X}" for v in rng.integers(0, 2**24, args.n)]
+    rgb = hexes_to_rgb(hexes)
+    rgb_tuples = [tuple(row) for row in rgb.tolist()]
+
+    cases = [
+        ("hex -> rgb", lambda: [legacy_hex_to_rgb(h) for h in hexes],
+         lambda: hexes_to_rgb(hexes)),
+        ("rgb -> 'rgb(...)'", lambda: [legacy_floats_to_rgbstring(c) for c in rgb_tuples],
+         lambda: rgb_to_strings(rgb)),
+        ("rgb -> hex", lambda: [legacy_rgb_to_hex(c) for c in rgb_tuples],
+         lambda: rgb_to_hex(rgb)),
+    ]
+
+    assert rgb_to_strings(rgb) == [legacy_floats_to_rgbstring(c) for c in rgb_tuples]
+    assert rgb_to_hex(rgb) == hexes
+
+    print(f"{args.n:,} colors")
+    print(f"{'conversion':<20}{'per-color (s)':>15}{'batch (s)':>12}{'speedup':>10}")
+    for name, legacy, batch in cases:
+        t_legacy = best_of(legacy, repeat=3)
+        t_batch = best_of(batch, repeat=3)
+        print(f"{name:<20}{t_legacy:>15.3f}{t_batch:>12.3f}{t_legacy / t_batch:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
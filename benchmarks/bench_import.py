@@ -0,0 +1,61 @@
+"""Import-time benchmark for ``import plotfair``.
+
+Runs the import in fresh interpreters, reports the wall time and fails (exit code 1)
+if the plotting backends (plotly, seaborn, interplot) are imported eagerly again.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+FORBIDDEN = ("plotly", "seaborn", "interplot")
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import plotfair
+elapsed = time.perf_counter() - t0
+loaded = sorted({m.split('.')[0] for m in sys.modules})
+print(json.dumps({"elapsed": elapsed, "modules": loaded}))
+"""
+
+
+def run_once():
+    """Import plotfair in a fresh interpreter and return (seconds, top-level modules)."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=repo_root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True,
+                         check=True, env=env)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["elapsed"], set(result["modules"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    times = []
+    modules = set()
+    for _ in range(args.repeat):
+        elapsed, modules = run_once()
+        times.append(elapsed)
+
+    print(f"import plotfair: best {min(times) * 1e3:.1f} ms, "
+          f"mean {sum(times) / len(times) * 1e3:.1f} ms over {args.repeat} runs")
+
+    leaked = [m for m in FORBIDDEN if m in modules]
+    if leaked:
+        print(f"FAIL: `import plotfair` imported {', '.join(leaked)} eagerly")
+        return 1
+    print(f"OK: none of {', '.join(FORBIDDEN)} imported")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""Throughput and accuracy of the sRGB <-> CAM02-UCS lookup tables against colorspacious.
+
+Usage:
+    python benchmarks/bench_perceptual_lut.py [--n N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Run from a checkout without installing plotfair
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plotfair import perceptual
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rgb = np.random.default_rng(0).random((args.n, 3))
+
+    _, t_build = timed(perceptual.srgb_to_cam02ucs, rgb[:1], exact=False)
+    _, t_build_inv = timed(perceptual.cam02ucs_to_srgb, np.zeros((1, 3)), exact=False)
+    print(f"table build: forward {t_build:.2f} s, inverse {t_build_inv:.2f} s (once per process)")
+
+    exact_jab, t_exact = timed(perceptual.srgb_to_cam02ucs, rgb, exact=True)
+    approx_jab, t_approx = timed(perceptual.srgb_to_cam02ucs, rgb, exact=False)
+    exact_rgb, t_exact_inv = timed(perceptual.cam02ucs_to_srgb, exact_jab, exact=True)
+    approx_rgb, t_approx_inv = timed(perceptual.cam02ucs_to_srgb, exact_jab, exact=False)
+
+    print(f"{args.n:,} colors")
+    print(f"{'direction':<22}{'exact (Mcol/s)':>16}{'LUT (Mcol/s)':>14}{'speedup':>10}")
+    for name, t_e, t_a in [("sRGB1 -> CAM02-UCS", t_exact, t_approx),
+                           ("CAM02-UCS -> sRGB1", t_exact_inv, t_approx_inv)]:
+        print(f"{name:<22}{args.n / t_e / 1e6:>16.2f}{args.n / t_a / 1e6:>14.2f}{t_e / t_a:>9.1f}x")
+
+    delta_e = np.linalg.norm(approx_jab - exact_jab, axis=1)
+    rgb_err = np.abs(approx_rgb - rgb).max(axis=1)
+    print(f"forward Delta-E': max {delta_e.max():.3f}, "
+          f"p99.9 {np.percentile(delta_e, 99.9):.3f}, mean {delta_e.mean():.4f}")
+    print(f"inverse abs error: max {rgb_err.max():.4f}, "
+          f"p99.9 {np.percentile(rgb_err, 99.9):.4f}, mean {rgb_err.mean():.5f}")
+
+
+if __name__ == "__main__":
+    main()
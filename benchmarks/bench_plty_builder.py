@@ -0,0 +1,73 @@
+"""Figure-construction benchmark: Plty with validated go objects vs builder mode.
+
+Builds the same figure with ``Plty()`` and ``Plty(builder=True)``: ``--traces`` line
+traces of ``--points`` points, each followed by a few layout updates (limits and
+labels, as in a plotting loop), then serializes it to JSON. Reports build and
+serialization times and checks that both paths produce identical JSON.
+
+Usage:
+    python benchmarks/bench_plty_builder.py [--traces N] [--points N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Run from a checkout without installing plotfair
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plotfair.plt_y import Plty
+
+
+def build(plty, series):
+    for i, (x, y) in enumerate(series):
+        plty.plot(x, y, label=f"trace {i}", alpha=0.8)
+        plty.xlim(0, len(x))
+        plty.ylim(-5, 5 + i)
+        plty.ylabel(f"{i + 1} traces")
+    plty.title("Builder benchmark")
+    plty.xlabel("sample")
+    return plty
+
+
+def measure(builder, series):
+    """Return (build seconds, serialize seconds, JSON)."""
+    start = time.perf_counter()
+    plty = build(Plty(builder=builder), series)
+    built = time.perf_counter()
+    payload = plty.fig.to_json()
+    return built - start, time.perf_counter() - built, payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--traces", type=int, default=500)
+    parser.add_argument("--points", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = np.arange(args.points)
+    series = [(x, rng.normal(size=args.points).cumsum() / 10) for _ in range(args.traces)]
+    measure(True, series[:2])  # warm up the template cache and imports
+
+    results = {}
+    for label, builder in (("go.Figure (validated)", False), ("builder (dicts)", True)):
+        runs = [measure(builder, series) for _ in range(args.repeat)]
+        build_s, serialize_s, payload = min(runs, key=lambda r: r[0] + r[1])
+        results[label] = payload
+        print(f"{label:<24} build {build_s:7.3f} s  to_json {serialize_s:6.3f} s  "
+              f"total {build_s + serialize_s:7.3f} s")
+
+    validated, built = results.values()
+    same = json.loads(validated) == json.loads(built)
+    print("identical JSON" if same else "JSON DIFFERS")
+    raise SystemExit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
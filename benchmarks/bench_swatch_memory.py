@@ -0,0 +1,89 @@
+"""Memory benchmark: 1M ColorSwatch objects, legacy layout vs the compact one.
+
+The legacy class is the pre-``__slots__`` ColorSwatch (per-instance ``__dict__``, a
+mutable tag set per swatch, RGB and HSL tuples computed in ``__init__``), inlined here
+for comparison. Memory is measured with tracemalloc and includes the swatch objects,
+their tags and derived tuples; the input name and hex strings are allocated first and
+not counted.
+
+Usage:
+    python benchmarks/bench_swatch_memory.py [--n N]
+"""
+
+import argparse
+import colorsys
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# Run from a checkout without installing plotfair
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from plotfair.colors import ColorSwatch, hex_to_rgb
+
+TAG_SETS = [{"bright", "red"}, {"dark", "blue"}, {"muted", "green"}, {"bright", "teal"}, set()]
+
+
+class LegacyColorSwatch:
+    def __init__(self, name, hex_code, tags=None):
+        self.name = name
+        self.hex = hex_code.upper()
+        self.tags = set(tags) if tags else set()
+        self.rgb = hex_to_rgb(self.hex)
+        self.hsl = self._hex_to_hsl()
+
+    def _hex_to_hsl(self):
+        r, g, b = self.rgb
+        hue, lightness, saturation = colorsys.rgb_to_hls(r, g, b)
+        return hue * 360, saturation, lightness
+
+
+def measure(build):
+    """Return (result, seconds, bytes allocated and still live)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    names = [f"color {i}" for i in range(args.n)]
+    hexes = [f"#{v:06X}" for v in rng.integers(0, 1 << 24, args.n).tolist()]
+    tags = [TAG_SETS[i % len(TAG_SETS)] for i in range(args.n)]
+
+    def report(label, seconds, size):
+        print(f"{label:<34} {seconds:6.2f} s  {size / 2**20:8.1f} MiB  "
+              f"{size / args.n:6.0f} B/swatch")
+
+    legacy, seconds, size = measure(
+        lambda: [LegacyColorSwatch(n, h, t) for n, h, t in zip(names, hexes, tags)])
+    report("legacy (dict, set, eager rgb/hsl)", seconds, size)
+    del legacy
+
+    compact, seconds, size = measure(
+        lambda: [ColorSwatch(n, h, t) for n, h, t in zip(names, hexes, tags)])
+    report("compact (slots, lazy)", seconds, size)
+
+    def touch():
+        for swatch in compact:
+            swatch.hsl
+        return compact
+    _, seconds, extra = measure(touch)
+    report("compact after rgb/hsl access", seconds, size + extra)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,22 +8,68 @@ Main modules:
 - colormaps: Colormap creation utilities
 - plt_y: Matplotlib-like Plotly wrapper
 - interplot_presets: interplot presets and patches
+
+The plotting backends (``presets``, ``plt_y`` and ``interplot_presets``) pull in
+seaborn, plotly and interplot, so they are only imported on first attribute access
+(PEP 562). ``import plotfair`` itself only loads matplotlib, numpy and colorspacious.
+
+Set ``PLOTFAIR_AUTOACTIVATE=0`` to keep imports free of rcParams, savefig and template
+changes and apply them explicitly with ``plotfair.activate()``.
 """
 
+import importlib
+
 # Core utilities
-from . import colormaps, presets
-from .colors import floats_to_rgbstring, hex_to_rgb, paintkit, paintkit_to_colorway, show_colormap
-from .interplot_presets import Iplt
+from . import colormaps
+from .activation import activate, deactivate
+from .colors import (
+    floats_to_rgbstring,
+    hex_to_rgb,
+    hexes_to_rgb,
+    paintkit,
+    paintkit_to_colorway,
+    rgb_to_hex,
+    rgb_to_strings,
+    show_colormap,
+)
+
+# Lazily imported submodules and objects: name -> (module, attribute or None for the module)
+_LAZY_ATTRS = {
+    "presets": (".presets", None),
+    "plt_y": (".plt_y", None),
+    "interplot_presets": (".interplot_presets", None),
+    "Plty": (".plt_y", "Plty"),
+    "Iplt": (".interplot_presets", "Iplt"),
+}
+
+
+def __getattr__(name):
+    """Import the plotting backends on first access."""
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
-# Optional plotting wrappers
-from .plt_y import Plty
 
 __all__ = [
+    "activate",
+    "deactivate",
     "paintkit",
     "paintkit_to_colorway",
     "show_colormap",
     "hex_to_rgb",
     "floats_to_rgbstring",
+    "hexes_to_rgb",
+    "rgb_to_hex",
+    "rgb_to_strings",
     "presets",
     "colormaps",
     "Plty",
@@ -0,0 +1,255 @@
+"""
+plotfair.activation
+Explicit, idempotent application of the plotfair presets.
+
+The presets are grouped into backends:
+
+- ``colors``: the default matplotlib color cycle built from the paintkit.
+- ``matplotlib``: the rcParams and seaborn style from :mod:`plotfair.presets`
+  and the ``plt.savefig`` wrapper that saves into a folder.
+- ``plotly``: the ``pridepy``/``loglog`` Plotly templates and the default template.
+- ``interplot``: interplot configuration and the patched ``Plot.show/save/clear``.
+
+By default each module still applies its own backend when it is imported. Set the
+environment variable ``PLOTFAIR_AUTOACTIVATE=0`` before importing plotfair to make
+all imports side-effect free, and call :func:`activate` explicitly instead.
+"""
+
+import functools
+import os
+import threading
+
+BACKENDS = ("colors", "matplotlib", "plotly", "interplot")
+
+AUTOACTIVATE = os.environ.get("PLOTFAIR_AUTOACTIVATE", "1").strip().lower() not in (
+    "0", "false", "no", "off"
+)
+
+_MISSING = object()
+_lock = threading.RLock()
+_active = {}  # backend name -> undo callable for process-wide activations
+_entering = threading.local()  # .depth > 0 while a context activation applies presets
+
+
+# --- State helpers ---
+def _validated_rc(params):
+    """Run rcParams validation up front so later comparisons are cheap."""
+    import matplotlib as mpl
+    return dict(mpl.RcParams(params))
+
+
+def _apply_rc(params):
+    """Set only the rcParams that differ from ``params`` and return an undo callable."""
+    import matplotlib as mpl
+    previous = {}
+    for key, value in params.items():
+        current = mpl.rcParams[key]
+        try:
+            unchanged = bool(current == value)
+        except ValueError:
+            unchanged = False
+        if not unchanged:
+            previous[key] = current
+    mpl.rcParams.update({key: params[key] for key in previous})
+
+    def undo():
+        mpl.rcParams.update(previous)
+    return undo
+
+
+def _set_attrs(obj, attrs):
+    """Set attributes on a module or class and return an undo callable."""
+    previous = {name: vars(obj).get(name, _MISSING) for name in attrs}
+    for name, value in attrs.items():
+        setattr(obj, name, value)
+
+    def undo():
+        for name, value in previous.items():
+            if value is _MISSING:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, value)
+    return undo
+
+
+def _chain(undos):
+    def undo():
+        for fn in reversed(undos):
+            fn()
+    return undo
+
+
+# --- Backends ---
+@functools.lru_cache(maxsize=None)
+def _colors_rc():
+    from . import colors
+    if not colors.use_paintkit:
+        return {}
+    return _validated_rc({"axes.prop_cycle": colors.scheme.to_cycler()})
+
+
+def _activate_colors():
+    return _apply_rc(_colors_rc())
+
+
+@functools.lru_cache(maxsize=None)
+def _matplotlib_rc():
+    """Preset rcParams merged with the seaborn style, computed once per process."""
+    import seaborn as sns
+
+    from . import presets
+    style = dict(sns.axes_style(presets.SEABORN_STYLE, presets.SEABORN_STYLE_RC))
+    return _validated_rc({**presets.RC_PARAMS, **style})
+
+
+def _activate_matplotlib():
+    import matplotlib.pyplot as plt
+
+    from . import presets
+    return _chain([
+        _apply_rc(_matplotlib_rc()),
+        _set_attrs(plt, {"savefig": presets.savefig_with_folder}),
+    ])
+
+
+def _activate_plotly():
+    import plotly.io as pio
+
+    from . import plt_y
+    previous = {name: pio.templates[name] if name in pio.templates else _MISSING
+                for name in plt_y.TEMPLATES}
+    previous_default = pio.templates.default
+    for name, template in plt_y.TEMPLATES.items():
+        pio.templates[name] = template
+    pio.templates.default = plt_y.DEFAULT_TEMPLATE
+
+    def undo():
+        pio.templates.default = previous_default
+        for name, template in previous.items():
+            if template is _MISSING:
+                del pio.templates[name]
+            else:
+                pio.templates[name] = template
+    return undo
+
+
+@functools.lru_cache(maxsize=None)
+def _interplot_rc():
+    from . import interplot_presets
+    return _validated_rc(interplot_presets.RC_PARAMS)
+
+
+def _activate_interplot():
+    import interplot as iplot
+
+    from . import interplot_presets
+    return _chain([
+        _apply_rc(_interplot_rc()),
+        _set_attrs(iplot.conf, interplot_presets.INTERPLOT_CONF),
+        _set_attrs(iplot.Plot, {
+            "show": interplot_presets.show_and_close,
+            "save": interplot_presets.save_with_folder,
+            "clear": interplot_presets.rebuild_blank,
+        }),
+    ])
+
+
+_ACTIVATORS = {
+    "colors": _activate_colors,
+    "matplotlib": _activate_matplotlib,
+    "plotly": _activate_plotly,
+    "interplot": _activate_interplot,
+}
+
+
+def _resolve(backends):
+    if backends is None:
+        return BACKENDS
+    if isinstance(backends, str):
+        backends = (backends,)
+    backends = tuple(backends)
+    unknown = [b for b in backends if b not in _ACTIVATORS]
+    if unknown:
+        raise ValueError(f"Unknown backends {unknown}; choose from {BACKENDS}")
+    return backends
+
+
+# --- Public API ---
+class Activation:
+    """Context manager that applies presets on entry and restores the previous state on exit.
+
+    Only the settings that actually differ are changed and remembered, so entering and
+    leaving is cheap enough to do once per job. Instances can be reused and nested.
+    """
+
+    def __init__(self, backends):
+        self.backends = backends
+        self._undo_stack = []
+
+    def __enter__(self):
+        with _lock:
+            # Backend modules imported from here must not activate themselves globally
+            _entering.depth = getattr(_entering, "depth", 0) + 1
+            try:
+                self._undo_stack.append(_chain([_ACTIVATORS[name]() for name in self.backends]))
+            finally:
+                _entering.depth -= 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with _lock:
+            self._undo_stack.pop()()
+        return False
+
+    def __repr__(self):
+        return f"Activation(backends={self.backends})"
+
+
+def activate(backends=None, scope="global"):
+    """Apply the plotfair presets.
+
+    Args:
+        backends: Backend name or iterable of names from ``BACKENDS``.
+            None applies all of them.
+        scope: ``"global"`` applies the presets for the rest of the process. Backends
+            that are already active are skipped, so repeated calls are free.
+            ``"context"`` returns an :class:`Activation` to use in a ``with`` block;
+            the presets are applied on entry and the previous state is restored on exit.
+
+    Returns:
+        None for ``scope="global"``, an :class:`Activation` for ``scope="context"``.
+    """
+    backends = _resolve(backends)
+    if scope == "context":
+        return Activation(backends)
+    if scope != "global":
+        raise ValueError(f"scope must be 'global' or 'context', not {scope!r}")
+    with _lock:
+        for name in backends:
+            if name not in _active:
+                _active[name] = _ACTIVATORS[name]()
+
+
+def autoactivate(backend):
+    """Import-time hook of the backend modules: activate ``backend`` unless disabled.
+
+    Does nothing with ``PLOTFAIR_AUTOACTIVATE=0``, or when the module is first imported
+    by an ``activate(scope="context")`` block, whose presets must end with the block.
+    """
+    if AUTOACTIVATE and not getattr(_entering, "depth", 0):
+        activate(backends=backend)
+
+
+def deactivate(backends=None):
+    """Undo process-wide activations made with ``activate(scope="global")``."""
+    backends = _resolve(backends)
+    with _lock:
+        for name in reversed(backends):
+            undo = _active.pop(name, None)
+            if undo is not None:
+                undo()
+
+
+def is_active(backend):
+    """Return True if ``backend`` has been activated process-wide."""
+    return backend in _active
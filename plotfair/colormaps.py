@@ -6,14 +6,27 @@ This module provides functions to create colormaps that
 are perceptually uniform or linear in sRGB space.
 It supports generating colormaps with anchor colors
 placed at nonuniform positions and visualizing colormaps.
+
+Perceptual lookup tables are memoized in a bounded LRU cache keyed by the
+normalized colors, positions, n and color space; see cache_info(), cache_clear()
+and set_cache_size(). They can also be persisted across processes in an on-disk
+cache directory (set_disk_cache() or the PLOTFAIR_CMAP_CACHE_DIR environment
+variable), from which they are memory-mapped read-only.
 """
 
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+
 import numpy as np
-from colorspacious import cspace_convert
 from matplotlib.colors import LinearSegmentedColormap, ListedColormap, to_rgb
 
+from . import perceptual
+
 
-def perceptual_colormap_nonuniform(colors, positions=None, n=256, space="CAM02-UCS"):
+def perceptual_colormap_nonuniform(colors, positions=None, n=256, space="CAM02-UCS", exact=True):
     """
     Generate a perceptually uniform colormap between fixed color anchors at nonuniform positions.
 
@@ -25,6 +38,8 @@ def perceptual_colormap_nonuniform(colors, positions=None, n=256, space="CAM02-U
                                   If None, colors are assumed to be evenly spaced.
         n (int): Number of points in the output colormap.
         space (str): The color space in which to perform interpolation (default is "CAM02-UCS").
+        exact (bool): If False and space is "CAM02-UCS", convert through the lookup
+                      tables of plotfair.perceptual instead of colorspacious.
 
     Returns:
         ListedColormap: A matplotlib ListedColormap object representing
@@ -37,22 +52,264 @@ def perceptual_colormap_nonuniform(colors, positions=None, n=256, space="CAM02-U
         assert len(colors) == len(positions)
         assert positions[0] == 0.0 and positions[-1] == 1.0
     rgb_colors = np.array([to_rgb(c) for c in colors])
-    perceptual_colors = cspace_convert(rgb_colors, "sRGB1", space)
-    steps = np.linspace(0, 1, n)
-    interpolated = []
-    for idx in range(len(positions) - 1):
-        start_pos = positions[idx]
-        end_pos = positions[idx + 1]
-        start_col = perceptual_colors[idx]
-        end_col = perceptual_colors[idx + 1]
-        segment_mask = (steps >= start_pos) & (steps <= end_pos)
-        local_t = (steps[segment_mask] - start_pos) / (end_pos - start_pos)
-        for t in local_t:
-            interpolated.append((1 - t) * start_col + t * end_col)
-    interpolated = np.array(interpolated)
-    rgb_interp = cspace_convert(interpolated, space, "sRGB1")
-    rgb_interp = np.clip(rgb_interp, 0, 1)
-    return ListedColormap(rgb_interp, name="perceptual_nonuniform")
+    lut = perceptual_lut(rgb_colors, positions, n, space, exact=exact)
+    return ListedColormap(lut, name="perceptual_nonuniform")
+
+
+def perceptual_lut(rgb_colors, positions, n=256, space="CAM02-UCS", exact=True,
+                   anchor_coords=None):
+    """
+    Compute (or fetch from the cache) the sRGB lookup table of a perceptual colormap.
+
+    Parameters:
+        rgb_colors (array): (K, 3) anchor colors as sRGB floats in [0, 1].
+        positions (list or array): K anchor positions from 0.0 to 1.0.
+        n (int): Number of entries in the table.
+        space (str): Color space in which to interpolate.
+        exact (bool): False uses the approximate lookup-table conversion where available.
+        anchor_coords (array or None): Already computed (K, 3) coordinates of the
+                                       anchors in ``space``, used on a cache miss
+                                       instead of converting ``rgb_colors`` again.
+
+    Returns:
+        ndarray: Read-only (n, 3) array of sRGB values clipped to [0, 1]. The same
+                 array is shared by every caller that hits the cache.
+    """
+    rgb_colors = np.asarray(rgb_colors, dtype=float).reshape(-1, 3)
+    key = ("perceptual", tuple(map(tuple, rgb_colors.tolist())),
+           tuple(float(p) for p in positions), int(n), space, bool(exact))
+    lut = _lut_cache.get(key)
+    if lut is None:
+        disk_cache = _disk_cache
+        lut = disk_cache.load(key) if disk_cache is not None else None
+        if lut is None:
+            if anchor_coords is None:
+                perceptual_colors = perceptual.convert(rgb_colors, "sRGB1", space, exact=exact)
+            else:
+                perceptual_colors = np.asarray(anchor_coords, dtype=float).reshape(-1, 3)
+            interpolated = interpolate_anchors(perceptual_colors, positions, n)
+            lut = np.clip(perceptual.convert(interpolated, space, "sRGB1", exact=exact), 0, 1)
+            lut.setflags(write=False)
+            if disk_cache is not None:
+                disk_cache.store(key, lut)
+        _lut_cache.put(key, lut)
+    return lut
+
+
+def interpolate_anchors(anchors, positions, n):
+    """
+    Piecewise-linearly interpolate anchor values at n evenly spaced steps in [0, 1].
+
+    All steps are placed with one searchsorted pass, so the cost is O(n) array work
+    with no Python loop over steps or segments. A step that falls exactly on an
+    interior anchor is produced once.
+
+    Parameters:
+        anchors (array): (K, C) values at the anchor positions.
+        positions (list or array): K non-decreasing floats from 0.0 to 1.0.
+        n (int): Number of output steps.
+
+    Returns:
+        ndarray: (n, C) interpolated values.
+    """
+    anchors = np.asarray(anchors, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    assert np.all(np.diff(positions) >= 0), "positions must be non-decreasing"
+    steps = np.linspace(0.0, 1.0, n)
+    if len(positions) == 1:
+        return np.repeat(anchors[:1], n, axis=0)
+    segment = np.clip(np.searchsorted(positions, steps, side="right") - 1, 0, len(positions) - 2)
+    start = positions[segment]
+    width = positions[segment + 1] - start
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(width > 0, (steps - start) / width, 0.0)[:, None]
+    return (1 - t) * anchors[segment] + t * anchors[segment + 1]
+
+
+# --- Colormap cache ---
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize",
+                                     "maxbytes", "currbytes"])
+
+# Default bound on the memory held by cached tables (a table of n=10**6 steps is 24 MB)
+MAX_CACHE_BYTES = 64 * 2**20
+
+
+class _LRUCache:
+    """Thread-safe LRU mapping bounded by entry count and total ``nbytes``.
+
+    Keeps hit/miss/eviction counters. A value larger than ``max_bytes`` on its own is
+    not kept.
+    """
+
+    def __init__(self, maxsize=128, max_bytes=MAX_CACHE_BYTES):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._data[key] = value
+            self._nbytes += value.nbytes
+            self._evict()
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.maxsize or self._nbytes > self.max_bytes):
+            _, value = self._data.popitem(last=False)
+            self._nbytes -= value.nbytes
+            self.evictions += 1
+
+    def resize(self, maxsize, max_bytes=None):
+        with self._lock:
+            self.maxsize = maxsize
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize,
+                             len(self._data), self.max_bytes, self._nbytes)
+
+
+_lut_cache = _LRUCache()
+
+
+def cache_info():
+    """
+    Report colormap cache statistics, like functools.lru_cache.
+
+    Returns:
+        CacheInfo: Named tuple of (hits, misses, evictions, maxsize, currsize, maxbytes,
+                   currbytes).
+    """
+    return _lut_cache.info()
+
+
+def cache_clear():
+    """Empty the colormap cache and reset its statistics."""
+    _lut_cache.clear()
+
+
+def set_cache_size(maxsize, max_bytes=None):
+    """
+    Set the bounds of the in-memory colormap cache.
+
+    Parameters:
+        maxsize (int): Maximum number of cached tables; least recently used entries are
+                       evicted to fit. 0 disables caching.
+        max_bytes (int): Maximum total size of the cached tables (default: unchanged,
+                         initially ``MAX_CACHE_BYTES``).
+    """
+    _lut_cache.resize(int(maxsize), None if max_bytes is None else int(max_bytes))
+
+
+class _DiskCache:
+    """Directory of .npy lookup tables named by a content hash of their inputs.
+
+    Entries are written to a temporary file and atomically renamed into place, so
+    concurrent writers never expose partial files. Loads are memory-mapped
+    read-only, letting forked workers share the pages. Reads refresh an entry's
+    mtime and the least recently used entries are deleted once the directory
+    exceeds ``max_bytes``.
+    """
+
+    VERSION = 1
+
+    def __init__(self, directory, max_bytes):
+        self.directory = os.path.expanduser(os.fspath(directory))
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        digest = hashlib.sha256(repr((self.VERSION, key)).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.npy")
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            lut = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return lut
+
+    def store(self, key, lut):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, np.asarray(lut))
+            os.replace(tmp_path, self.path(key))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+_disk_cache = None
+
+
+def set_disk_cache(directory, max_bytes=256 * 2**20):
+    """
+    Persist perceptual colormap tables in a directory shared between processes.
+
+    Parameters:
+        directory (str or Path or None): Cache directory (created if needed).
+                                         None disables the disk cache.
+        max_bytes (int): Size bound; least recently used entries are deleted beyond it.
+    """
+    global _disk_cache
+    _disk_cache = None if directory is None else _DiskCache(directory, int(max_bytes))
+
+
+if os.environ.get("PLOTFAIR_CMAP_CACHE_DIR"):
+    set_disk_cache(os.environ["PLOTFAIR_CMAP_CACHE_DIR"])
 
 
 def srgb_gradient_colormap(colors, positions=None, n=256, name="srgb_colormap"):
@@ -1,26 +1,162 @@
 import colorsys
-import csv
+import itertools
 import os
 
-import matplotlib as mpl
 import numpy as np
 from colorspacious import cspace_convert
 from matplotlib import cycler
-from matplotlib.colors import LinearSegmentedColormap, ListedColormap, to_rgb
+from matplotlib.colors import LinearSegmentedColormap, ListedColormap, to_rgb, to_rgba_array
+
+from . import activation, colormaps
+
+
+# --- Hex / RGB conversion ---
+# ASCII byte -> hex digit value (255 marks an invalid character)
+_HEX_NIBBLES = np.full(256, 255, dtype=np.uint8)
+_HEX_NIBBLES[np.frombuffer(b"0123456789", dtype=np.uint8)] = np.arange(10)
+_HEX_NIBBLES[np.frombuffer(b"abcdef", dtype=np.uint8)] = np.arange(10, 16)
+_HEX_NIBBLES[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+_HEX_PAIRS = np.array([f"{i:02X}" for i in range(256)])
+_DECIMALS = np.array([str(i) for i in range(256)])
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def hexes_to_rgb(hex_codes, dtype=np.float32):
+    """Convert many hex color codes to an (N, 3) array of RGB values in 0-1.
+
+    Accepts 3, 4, 6 or 8 digit codes with or without a leading '#'; the alpha
+    digits of 4/8 digit codes are ignored. The codes are decoded as one byte
+    buffer with table lookups, without a Python loop per color.
+
+    Args:
+        hex_codes: Sequence or array of hex strings (str or bytes).
+        dtype: Float dtype of the result.
+
+    Raises:
+        ValueError: If any code is not a valid hex color.
+    """
+    codes = np.asarray(hex_codes)
+    if codes.dtype.kind not in "US":
+        codes = codes.astype(str)
+    codes = np.ascontiguousarray(codes.reshape(-1))
+    n = len(codes)
+    if n == 0:
+        return np.empty((0, 3), dtype=dtype)
+    # Zero-copy view of the characters: UCS4 code points for str, bytes for bytes
+    char_dtype = np.uint32 if codes.dtype.kind == "U" else np.uint8
+    buf = codes.view(char_dtype).reshape(n, -1)
+    if buf.shape[1] < 9:
+        buf = np.pad(buf, ((0, 0), (0, 9 - buf.shape[1])))
+
+    offset = (buf[:, 0] == ord("#")).astype(np.intp)
+    digits = np.count_nonzero(buf, axis=1) - offset
+    if offset.min() == offset.max():
+        chars = buf[:, offset[0]:offset[0] + 8]
+    else:
+        chars = np.take_along_axis(buf, offset[:, None] + np.arange(8), axis=1)
+    nibbles = _HEX_NIBBLES[np.minimum(chars, 255)].astype(np.uint16)
+
+    in_code = np.arange(8) < digits[:, None]
+    bad = ~np.isin(digits, (3, 4, 6, 8)) | np.any((nibbles > 15) & in_code, axis=1)
+    if bad.any():
+        raise ValueError(f"Invalid hex color code: {codes[bad.argmax()].item()!r}")
+
+    long_form = nibbles[:, 0:6:2] * 16 + nibbles[:, 1:6:2]
+    short_form = nibbles[:, 0:3] * 17
+    levels = np.where((digits >= 6)[:, None], long_form, short_form)
+    return (levels / 255.0).astype(dtype, copy=False)
+
+
+def _rgb_levels(rgb, rounding):
+    """(N, 3) float RGB in 0-1 to clipped integer levels 0-255."""
+    scaled = np.asarray(rgb, dtype=float).reshape(-1, 3) * 255
+    scaled = np.rint(scaled) if rounding else np.trunc(scaled)
+    return np.clip(scaled, 0, 255).astype(np.intp)
+
+
+def rgb_to_hex(rgb):
+    """Convert an (N, 3) array of RGB values in 0-1 to a list of '#RRGGBB' strings."""
+    levels = _rgb_levels(rgb, rounding=True)
+    hexes = np.char.add(np.char.add("#", _HEX_PAIRS[levels[:, 0]]),
+                        np.char.add(_HEX_PAIRS[levels[:, 1]], _HEX_PAIRS[levels[:, 2]]))
+    return hexes.tolist()
+
+
+def rgb_to_strings(rgb):
+    """Convert an (N, 3) array of RGB values in 0-1 to plotly 'rgb(r, g, b)' strings.
+
+    Channels are truncated to integers like ``floats_to_rgbstring`` and clipped to 0-255.
+    """
+    levels = _rgb_levels(rgb, rounding=False)
+    parts = np.char.add("rgb(", _DECIMALS[levels[:, 0]])
+    parts = np.char.add(np.char.add(parts, ", "), _DECIMALS[levels[:, 1]])
+    parts = np.char.add(np.char.add(parts, ", "), _DECIMALS[levels[:, 2]])
+    return np.char.add(parts, ")").tolist()
 
 
 # --- ColorSwatch and PaintKit ---
 def hex_to_rgb(hex_code):
     """Convert a hex color code to an RGB tuple with values 0-1."""
-    hex_clean = hex_code.lstrip("#")
-    return tuple(int(hex_clean[i:i+2], 16)/255 for i in (0, 2, 4))
+    if not isinstance(hex_code, str):
+        return tuple(hexes_to_rgb([hex_code], dtype=np.float64)[0].tolist())
+    # Scalar fast path, same rules as hexes_to_rgb without the per-call array overhead
+    digits = hex_code[1:] if hex_code[:1] == "#" else hex_code
+    if len(digits) in (3, 4):
+        digits = digits[0] * 2 + digits[1] * 2 + digits[2] * 2
+    elif len(digits) == 8:
+        digits = digits[:6]
+    if len(digits) != 6 or not _HEX_DIGITS.issuperset(hex_code.lstrip("#")):
+        raise ValueError(f"Invalid hex color code: {hex_code!r}")
+    value = int(digits, 16)
+    return (value >> 16) / 255, (value >> 8 & 255) / 255, (value & 255) / 255
 def floats_to_rgbstring(color_float):
     """Convert a float tuple to an RGB string for use by plotly
     form (0.0, 0.0, 0.0) to "rgb(0, 0, 0)"""
-    return f"rgb({int(color_float[0]*255)}, {int(color_float[1]*255)}, {int(color_float[2]*255)})"
+    return rgb_to_strings([color_float[:3]])[0]
+
+def _rgb_to_hsl_array(rgb):
+    """Vectorized colorsys.rgb_to_hls for an (N, 3) array.
+
+    Returns an (N, 3) array of (hue in degrees, saturation, lightness).
+    """
+    rgb = np.asarray(rgb, dtype=float).reshape(-1, 3)
+    r, g, b = rgb.T
+    maxc = rgb.max(axis=1)
+    minc = rgb.min(axis=1)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    lightness = sumc / 2.0
+    grey = rangec == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        saturation = np.where(lightness <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc))
+        rc = (maxc - r) / rangec
+        gc = (maxc - g) / rangec
+        bc = (maxc - b) / rangec
+    hue = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    hue = (hue / 6.0) % 1.0
+    hue[grey] = 0.0
+    saturation[grey] = 0.0
+    return np.column_stack([hue * 360, saturation, lightness])
+
+
+# Interned tag sets: swatches with equal tags share one frozenset
+_TAG_SETS = {}
+
+
+def _intern_tags(tags):
+    tags = frozenset(tags) if tags else frozenset()
+    return _TAG_SETS.setdefault(tags, tags)
+
 
 class ColorSwatch:
-    """A single color with metadata including name, hex code, and tags."""
+    """A single color with metadata including name, hex code, and tags.
+
+    Swatches are immutable and compact: they use ``__slots__``, swatches with the
+    same tags share one interned frozenset, and ``rgb``, ``hsl`` and the CAM02-UCS
+    coordinates are computed on first access and cached.
+    """
+
+    __slots__ = ("name", "hex", "tags", "_rgb", "_hsl", "_jab")
 
     def __init__(self, name, hex_code, tags=None):
         """Create a color swatch.
@@ -30,11 +166,58 @@ class ColorSwatch:
             hex_code: Hex color code (e.g., '#FF5500').
             tags: Optional set of tags for filtering (e.g., {'bright', 'red'}).
         """
-        self.name = name
-        self.hex = hex_code.upper()
-        self.tags = set(tags) if tags else set()
-        self.rgb = hex_to_rgb(self.hex)
-        self.hsl = self._hex_to_hsl()
+        _init = object.__setattr__
+        _init(self, "name", name)
+        _init(self, "hex", hex_code.upper())
+        _init(self, "tags", _intern_tags(tags))
+        _init(self, "_rgb", None)
+        _init(self, "_hsl", None)
+        _init(self, "_jab", None)
+
+    @classmethod
+    def _view(cls, name, hex_code, tags, rgb, hsl):
+        """Build a swatch from values already computed by a PaintKit store."""
+        swatch = cls.__new__(cls)
+        _init = object.__setattr__
+        _init(swatch, "name", name)
+        _init(swatch, "hex", hex_code)
+        _init(swatch, "tags", _intern_tags(tags))
+        _init(swatch, "_rgb", rgb)
+        _init(swatch, "_hsl", hsl)
+        _init(swatch, "_jab", None)
+        return swatch
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ColorSwatch is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"ColorSwatch is immutable; cannot delete {name!r}")
+
+    def __reduce__(self):
+        return (ColorSwatch, (self.name, self.hex, self.tags))
+
+    @property
+    def rgb(self):
+        """(r, g, b) floats in 0-1."""
+        if self._rgb is None:
+            object.__setattr__(self, "_rgb", hex_to_rgb(self.hex))
+        return self._rgb
+
+    @property
+    def hsl(self):
+        """(hue in degrees, saturation, lightness)."""
+        if self._hsl is None:
+            object.__setattr__(self, "_hsl", self._hex_to_hsl())
+        return self._hsl
+
+    def perceptual(self, space="CAM02-UCS"):
+        """Coordinates of the color in ``space``; CAM02-UCS is cached on the swatch."""
+        if space != "CAM02-UCS":
+            return tuple(cspace_convert(self.rgb, "sRGB1", space).tolist())
+        if self._jab is None:
+            object.__setattr__(self, "_jab",
+                               tuple(cspace_convert(self.rgb, "sRGB1", space).tolist()))
+        return self._jab
 
     def _hex_to_hsl(self):
         """Convert the swatch's RGB to HSL (hue in degrees, saturation, lightness)."""
@@ -47,40 +230,451 @@ class ColorSwatch:
         return tag in self.tags
 
     def __repr__(self):
-        return f"ColorSwatch(name='{self.name}', hex='{self.hex}', tags={self.tags})"
+        return f"ColorSwatch(name='{self.name}', hex='{self.hex}', tags={set(self.tags)})"
+
+
+class _SwatchStore:
+    """Columnar storage behind a PaintKit, one row per swatch.
+
+    Holds names and hex codes, (N, 3) RGB and HSL arrays, perceptual coordinates
+    (computed lazily per color space) and an (N, T) boolean tag matrix over
+    ``tag_vocab``, plus an inverted tag index (see ``postings``) used for all
+    tag queries. All arrays are read-only so stores can be shared between kits.
+    """
+
+    def __init__(self, names, hexes, rgb, tag_vocab, tag_mask, hsl=None):
+        self.names = _readonly(np.asarray(names, dtype=object).reshape(-1))
+        self.hexes = _readonly(np.char.upper(np.asarray(hexes, dtype=str).reshape(-1)))
+        self.rgb = _readonly(np.asarray(rgb, dtype=float).reshape(-1, 3))
+        self.hsl = _readonly(_rgb_to_hsl_array(self.rgb) if hsl is None else np.asarray(hsl))
+        self.tag_vocab = tuple(tag_vocab)
+        self.tag_index = {tag: j for j, tag in enumerate(self.tag_vocab)}
+        self.tag_mask = _readonly(np.asarray(tag_mask, dtype=bool).reshape(len(self.names),
+                                                                            len(self.tag_vocab)))
+        self._postings = None
+        self._perceptual = {}
+        self._trees = {}
+        self._quantization_luts = {}
+
+    @classmethod
+    def from_columns(cls, names, hexes, tags, rgb=None):
+        """Build a store from parallel sequences of names, hex codes and tag sets."""
+        tags = [set(t) if t else set() for t in tags]
+        vocab = list(dict.fromkeys(tag for tag_set in tags for tag in sorted(tag_set)))
+        index = {tag: j for j, tag in enumerate(vocab)}
+        mask = np.zeros((len(tags), len(vocab)), dtype=bool)
+        rows = [i for i, tag_set in enumerate(tags) for _ in tag_set]
+        cols = [index[tag] for tag_set in tags for tag in tag_set]
+        mask[rows, cols] = True
+        if rgb is None:
+            rgb = hexes_to_rgb(hexes, dtype=np.float64)
+        return cls(names, hexes, rgb, vocab, mask)
+
+    @classmethod
+    def from_swatches(cls, swatches):
+        """Build a store from ColorSwatch objects, reusing their computed RGB."""
+        swatches = list(swatches)
+        rgb = np.array([s.rgb for s in swatches], dtype=float).reshape(-1, 3)
+        return cls.from_columns([s.name for s in swatches], [s.hex for s in swatches],
+                                [s.tags for s in swatches], rgb=rgb)
+
+    @classmethod
+    def concat_all(cls, stores):
+        """Concatenate any number of stores into one, merging their tag vocabularies."""
+        stores = list(stores)
+        vocab = list(dict.fromkeys(tag for store in stores for tag in store.tag_vocab))
+        index = {tag: j for j, tag in enumerate(vocab)}
+        sizes = [len(store) for store in stores]
+        mask = np.zeros((sum(sizes), len(vocab)), dtype=bool)
+        for store, start in zip(stores, np.cumsum([0] + sizes)):
+            mask[start:start + len(store), [index[t] for t in store.tag_vocab]] = store.tag_mask
+        if not stores:
+            return cls([], [], np.empty((0, 3)), vocab, mask)
+        return cls(np.concatenate([store.names for store in stores]),
+                   np.concatenate([store.hexes for store in stores]),
+                   np.concatenate([store.rgb for store in stores]),
+                   vocab, mask, hsl=np.concatenate([store.hsl for store in stores]))
+
+    def __len__(self):
+        return len(self.names)
+
+    def take(self, idx):
+        """Return a new store with the rows at ``idx`` (tags unused by them are dropped)."""
+        idx = np.asarray(idx, dtype=np.intp)
+        mask = self.tag_mask[idx]
+        used = mask.any(axis=0)
+        store = _SwatchStore(self.names[idx], self.hexes[idx], self.rgb[idx],
+                             [t for t, keep in zip(self.tag_vocab, used) if keep],
+                             mask[:, used], hsl=self.hsl[idx])
+        for space, coords in self._perceptual.items():
+            store._perceptual[space] = _readonly(coords[idx])
+        return store
+
+    def concat(self, other):
+        """Return a new store with the rows of ``self`` followed by ``other``."""
+        vocab = list(dict.fromkeys(self.tag_vocab + other.tag_vocab))
+        index = {tag: j for j, tag in enumerate(vocab)}
+        mask = np.zeros((len(self) + len(other), len(vocab)), dtype=bool)
+        mask[:len(self), :len(self.tag_vocab)] = self.tag_mask
+        mask[len(self):, [index[t] for t in other.tag_vocab]] = other.tag_mask
+        store = _SwatchStore(np.concatenate([self.names, other.names]),
+                             np.concatenate([self.hexes, other.hexes]),
+                             np.concatenate([self.rgb, other.rgb]),
+                             vocab, mask, hsl=np.concatenate([self.hsl, other.hsl]))
+        if self._postings is not None and other._postings is not None:
+            # Carry both indexes over instead of rebuilding from the tag matrix
+            store._postings = {
+                tag: _readonly(np.concatenate([self.tag_rows(tag),
+                                               other.tag_rows(tag) + len(self)]))
+                for tag in vocab
+            }
+        return store
+
+    def postings(self):
+        """Inverted tag index: tag -> sorted array of the rows carrying it.
+
+        Built once per store from the tag matrix, O(rows x tags).
+        """
+        if self._postings is None:
+            tags, rows = np.nonzero(self.tag_mask.T)
+            bounds = np.searchsorted(tags, np.arange(len(self.tag_vocab) + 1))
+            self._postings = {tag: _readonly(rows[bounds[j]:bounds[j + 1]])
+                              for j, tag in enumerate(self.tag_vocab)}
+        return self._postings
+
+    def tag_rows(self, tag):
+        """Sorted rows carrying ``tag`` (empty if the tag is unknown)."""
+        return self.postings().get(tag, _NO_ROWS)
+
+    def rows_with_all(self, tags):
+        """Sorted rows that carry every tag in ``tags`` (AND of the posting lists)."""
+        lists = sorted((self.tag_rows(tag) for tag in tags), key=len)
+        if not lists:
+            return np.arange(len(self))
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def rows_with_any(self, tags):
+        """Sorted rows that carry at least one tag in ``tags`` (OR of the posting lists)."""
+        lists = [self.tag_rows(tag) for tag in tags]
+        if len(lists) == 1:
+            return lists[0]
+        return np.unique(np.concatenate(lists)) if lists else _NO_ROWS
+
+    def tags_of(self, i):
+        """The tag set of row ``i``."""
+        return {self.tag_vocab[j] for j in np.flatnonzero(self.tag_mask[i])}
+
+    def perceptual(self, space="CAM02-UCS"):
+        """(N, 3) coordinates in ``space``, converted once for all rows and cached."""
+        coords = self._perceptual.get(space)
+        if coords is None:
+            coords = cspace_convert(self.rgb, "sRGB1", space) if len(self) else np.empty((0, 3))
+            coords = self._perceptual[space] = _readonly(coords)
+        return coords
+
+    def tree(self, space="CAM02-UCS"):
+        """KD-tree over the rows' coordinates in ``space``, built on first use."""
+        tree = self._trees.get(space)
+        if tree is None:
+            from scipy.spatial import cKDTree
+            tree = self._trees[space] = cKDTree(self.perceptual(space))
+        return tree
+
+    def swatch(self, i):
+        """A ColorSwatch view of row ``i``."""
+        return ColorSwatch._view(self.names[i], str(self.hexes[i]), self.tags_of(i),
+                                 tuple(self.rgb[i].tolist()), tuple(self.hsl[i].tolist()))
+
+
+def _as_rgb_array(colors):
+    """Normalize colors to an (N, 3) float sRGB array.
+
+    Accepts uint8 arrays in 0-255, other numeric arrays and sequences in 0-1 (like
+    matplotlib, so ``(1, 0, 0)`` is red), hex codes or any matplotlib color specification.
+    """
+    arr = np.asarray(colors)
+    if arr.dtype.kind in "US" or arr.dtype == object:
+        try:
+            return hexes_to_rgb(arr, dtype=np.float64)
+        except ValueError:
+            return to_rgba_array(list(arr.reshape(-1)))[:, :3]
+    if arr.ndim == 0 or arr.shape[-1] != 3:
+        raise ValueError(f"Expected RGB colors with 3 channels, got shape {arr.shape}")
+    if arr.dtype == np.uint8:
+        return arr.reshape(-1, 3) / 255.0
+    return arr.astype(float).reshape(-1, 3)
+
+
+def _readonly(arr):
+    arr = np.asarray(arr)
+    arr.setflags(write=False)
+    return arr
+
+
+_NO_ROWS = _readonly(np.empty(0, dtype=np.intp))
+
 
 class PaintKit:
-    """A collection of ColorSwatches with filtering and visualization methods."""
+    """A collection of ColorSwatches with filtering and visualization methods.
+
+    Swatch data is kept in columnar NumPy arrays (``names``, ``hexes``, ``rgb``,
+    ``hsl`` and a tag matrix) so filtering and conversions are vectorized.
+    ``colors`` builds the ColorSwatch objects on first access.
+
+    ``filter``, ``ordered_swatches`` and ``+`` (on kits derived from the same kit)
+    return views: an index array over the shared base store, so chained selections
+    cost O(result) and copy no swatch data. Use ``materialize`` for an independent copy.
+    """
+
+    # Default grid layout; every kit gets its own copy of these as lists
+    color_tags = ('green',
+                  'teal',
+                  'lightblue',
+                  'blue',
+                  'purple',
+                  'pink',
+                  'fuchia',
+                  'red',
+                  'orange',
+                  'yellow')
+    saturation_tags = ('bright', 'dark', 'muted')
 
     def __init__(self, colors):
         """Create a PaintKit from a list of ColorSwatch objects."""
-        self.colors = colors
-        self.color_tags = ['green',
-                           'teal',
-                           'lightblue',
-                            'blue',
-                            'purple',
-                            'pink',
-                            'fuchia',
-                            'red',
-                            'orange',
-                            'yellow']
-        self.saturation_tags = ['bright', 'dark', 'muted']
+        self._init_store(_SwatchStore.from_swatches(colors))
+        self._colors = list(colors)
+
+    def _init_store(self, store, rows=None):
+        self._base = store
+        self._rows = rows  # None for the whole base store, else base row indices
+        self._rows_sorted = rows is None or bool(np.all(rows[1:] > rows[:-1]))
+        self._view_store = None
+        self._colors = None
+        self.color_tags = list(type(self).color_tags)
+        self.saturation_tags = list(type(self).saturation_tags)
+
+    @classmethod
+    def _from_store(cls, store, rows=None):
+        kit = cls.__new__(cls)
+        kit._init_store(store, rows)
+        return kit
+
+    @property
+    def _store(self):
+        """Store holding exactly this kit's rows; built once for views that need one."""
+        if self._rows is None:
+            return self._base
+        if self._view_store is None:
+            self._view_store = self._base.take(self._rows)
+        return self._view_store
+
+    def _base_rows(self):
+        return np.arange(len(self._base)) if self._rows is None else self._rows
+
+    def _column(self, values):
+        return values if self._rows is None else _readonly(values[self._rows])
+
+    def materialize(self):
+        """Return an independent PaintKit with its own copy of this kit's swatches."""
+        return PaintKit._from_store(self._base.take(self._base_rows()))
+
+    @classmethod
+    def from_columns(cls, names, hex_codes, tags):
+        """Create a PaintKit directly from parallel columns, without ColorSwatch objects.
+
+        Args:
+            names: Sequence of display names.
+            hex_codes: Sequence of hex color codes.
+            tags: Sequence of tag sets (or None), one per color.
+        """
+        return cls._from_store(_SwatchStore.from_columns(names, hex_codes, tags))
+
+    @classmethod
+    def from_file(cls, path, cache=True):
+        """Load a PaintKit from a CSV, JSON-lines or Parquet palette file.
+
+        Columns are parsed in bulk and the compiled result is cached next to the file
+        (see ``plotfair.palette_io``), so repeated loads skip parsing entirely.
+
+        Args:
+            path: Palette file with 'name', 'hex_code' and 'tags' columns.
+            cache: Read and write the compiled cache.
+        """
+        from . import palette_io
+        return cls._from_store(_SwatchStore(**palette_io.read_palette_columns(path, cache=cache)))
+
+    @classmethod
+    def from_iter(cls, source, *, tags=None, any_tags=None, chunk_size=65536):
+        """Build a PaintKit incrementally from a palette file or an iterable of swatches.
+
+        The source is consumed ``chunk_size`` rows at a time and only the rows that pass
+        the tag filters are kept, so peak memory follows the result rather than the
+        source. For files, rejected rows are never converted to colors.
+
+        Args:
+            source: Path to a palette file (see ``from_file``) or an iterable of
+                ColorSwatch objects.
+            tags: Set of tags that must ALL be present.
+            any_tags: Set of tags where at least ONE must be present.
+            chunk_size: Number of rows read per chunk.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            from . import palette_io
+            chunks = palette_io.iter_palette_columns(source, chunk_size, tags=tags,
+                                                     any_tags=any_tags)
+            return cls._from_store(_SwatchStore.concat_all(
+                _SwatchStore(**columns) for columns in chunks))
+        required, wanted = set(tags or ()), set(any_tags or ())
+        stores = []
+        source = iter(source)
+        while True:
+            batch = list(itertools.islice(source, chunk_size))
+            if not batch:
+                break
+            kept = [s for s in batch
+                    if required <= s.tags and (not wanted or not wanted.isdisjoint(s.tags))]
+            if kept:
+                stores.append(_SwatchStore.from_swatches(kept))
+        return cls._from_store(_SwatchStore.concat_all(stores))
+
+    @property
+    def colors(self):
+        """List of ColorSwatch objects, created on first access."""
+        if self._colors is None:
+            self._colors = [self._base.swatch(i) for i in self._base_rows()]
+        return self._colors
+
+    @property
+    def names(self):
+        """Array of swatch names."""
+        return self._column(self._base.names)
+
+    @property
+    def hexes(self):
+        """Array of upper-case hex codes."""
+        return self._column(self._base.hexes)
+
+    @property
+    def rgb(self):
+        """(N, 3) array of RGB values in 0-1."""
+        return self._column(self._base.rgb)
+
+    @property
+    def hsl(self):
+        """(N, 3) array of (hue in degrees, saturation, lightness)."""
+        return self._column(self._base.hsl)
+
+    def perceptual(self, space="CAM02-UCS"):
+        """(N, 3) array of the swatches' coordinates in a colorspacious color space.
+
+        Coordinates are converted once for the whole base store and shared by its views.
+        """
+        return self._column(self._base.perceptual(space))
+
+    def nearest(self, colors, k=1, space="CAM02-UCS", return_distance=False):
+        """Find the swatches closest to arbitrary colors in a perceptual space.
+
+        Queries a KD-tree over the swatches' coordinates in ``space``. The tree is
+        built on first use and kept with the kit; kits are never modified in place,
+        so a filtered or combined kit gets its own tree.
+
+        Args:
+            colors: One color or a batch: an (N, 3) float array in 0-1, a uint8
+                array in 0-255, or a sequence of hex codes / matplotlib colors.
+            k: Number of neighbours per color.
+            space: colorspacious color space used for distances.
+            return_distance: Also return the distances in ``space``.
+
+        Returns:
+            Swatch indices into this kit, shaped (N,) for k=1 or (N, k) (a scalar or
+            (k,) for a single color). With ``return_distance`` a (distances, indices)
+            tuple.
+        """
+        if len(self) == 0:
+            raise ValueError("Cannot search an empty PaintKit")
+        if isinstance(colors, str):
+            colors = [colors]
+            single = True
+        else:
+            if not isinstance(colors, np.ndarray):
+                colors = list(colors)
+                if len({isinstance(c, str) for c in colors}) > 1:
+                    # Hex codes or names mixed with RGB tuples; np.asarray can't stack them
+                    colors = to_rgba_array(colors)[:, :3]
+            colors = np.asarray(colors)
+            single = colors.ndim == 1 and colors.dtype.kind not in "USO"
+        rgb = _as_rgb_array(colors)
+        points = cspace_convert(rgb, "sRGB1", space)
+        distances, indices = self._store.tree(space).query(points, k=min(k, len(self)))
+        if single:
+            distances, indices = distances[0], indices[0]
+        return (distances, indices) if return_distance else indices
+
+    def quantize_image(self, image, output="index", space="CAM02-UCS", **kwargs):
+        """Map every pixel of an (H, W, 3) image onto its nearest swatch.
+
+        See ``plotfair.quantize.quantize_image`` for the chunking, thread pool and
+        lookup-table options.
+
+        Args:
+            image: uint8 (0-255) or float (0-1) array, or a ``np.memmap``.
+            output: ``"index"`` for swatch indices into this kit, ``"image"`` for the
+                recolored image.
+            space: colorspacious color space used for distances.
+
+        Returns:
+            An (H, W) index array or an (H, W, 3) image.
+        """
+        from .quantize import quantize_image
+        return quantize_image(image, self, space=space, output=output, **kwargs)
 
     def __add__(self, other):
-        """Combine two PaintKits into one."""
-        return PaintKit(self.colors + other.colors)
+        """Combine two PaintKits into one.
+
+        Kits over the same base store combine into a view; otherwise the rows are copied.
+        """
+        if self._base is other._base:
+            rows = np.concatenate([self._base_rows(), other._base_rows()])
+            return PaintKit._from_store(self._base, _readonly(rows))
+        return PaintKit._from_store(self._store.concat(other._store))
 
     def __len__(self):
         """Return the number of colors in the kit."""
-        return len(self.colors)
+        return len(self._base) if self._rows is None else len(self._rows)
     def __repr__(self):
-        ret = ""
-        for color in self.colors:
-            ret += f"ColorSwatch(name='{color.name}', hex='{color.hex}', tags={color.tags}) \n"
+        return f"Collection of {len(self)} colors"
+
+    def _take(self, idx):
+        """View of the rows at positions ``idx`` of this kit."""
+        rows = np.asarray(idx, dtype=np.intp)
+        if self._rows is not None:
+            rows = self._rows[rows]
+        return PaintKit._from_store(self._base, _readonly(rows))
+
+    def _view_positions(self, base_rows):
+        """Sorted positions in this view of its rows that appear in the sorted ``base_rows``.
+
+        Binary-searches the shorter of the two into the other, so intersecting a view
+        with a posting list costs O(min(n, m) * log(max(n, m))).
+        """
+        if self._rows is None:
+            return base_rows
+        rows = self._rows
+        if self._rows_sorted and len(base_rows) < len(rows):
+            positions = np.searchsorted(rows, base_rows)
+            inside = positions < len(rows)
+            positions = positions[inside]
+            return positions[rows[positions] == base_rows[inside]]
+        if not len(base_rows):
+            return _NO_ROWS
+        found = np.minimum(np.searchsorted(base_rows, rows), len(base_rows) - 1)
+        return np.flatnonzero(base_rows[found] == rows)
 
-        self.display_paintkit( label='name')
-        return f"Collection of {len(self.colors)} colors"
     def filter(self, *, tags=None, any_tags=None):
         """Filter colors by tags.
 
@@ -91,16 +685,31 @@ class PaintKit:
         Returns:
             A new PaintKit with matching colors.
         """
-        result = self.colors
+        if self._rows is not None:
+            # View: intersect each posting list with this kit's rows
+            rows = None
+            if any_tags:
+                rows = np.unique(np.concatenate(
+                    [self._view_positions(self._base.tag_rows(tag)) for tag in any_tags]))
+            for tag in tags or ():
+                found = self._view_positions(self._base.tag_rows(tag))
+                rows = found if rows is None else np.intersect1d(rows, found,
+                                                                 assume_unique=True)
+            return self._take(np.arange(len(self)) if rows is None else rows)
+        rows = None
         if any_tags:
-            result = [c for c in result if c.tags & any_tags]
+            rows = self._base.rows_with_any(any_tags)
         if tags:
-            result = [c for c in result if tags.issubset(c.tags)]
-        return PaintKit(result)
+            all_rows = self._base.rows_with_all(tags)
+            rows = all_rows if rows is None else np.intersect1d(rows, all_rows, assume_unique=True)
+        if rows is None:
+            rows = np.arange(len(self))
+        return self._take(rows)
 
     def get_named(self, *names):
         """Get swatches by their exact names."""
-        return [c for c in self.colors if c.name in names]
+        rows = self._base_rows()[np.flatnonzero(np.isin(self.names, names))]
+        return [self._base.swatch(i) for i in rows]
 
     def ordered_swatches(self, tag_list):
         """Get swatches in a specific order by tag, one per tag.
@@ -111,139 +720,108 @@ class PaintKit:
         Returns:
             A new PaintKit with one swatch per tag in order.
         """
-        swatches = []
+        rows = []
         missing = []
         for tag in tag_list:
-            filtered = self.filter(tags={tag}).colors
-            if filtered:
-                swatches.append(filtered[0])
+            tag_rows = self._view_positions(self._base.tag_rows(tag))
+            if len(tag_rows):
+                rows.append(tag_rows[0])
             else:
                 missing.append(tag)
         if missing:
             print(f"Missing tags: {missing}")
-        return PaintKit(swatches)
+        return self._take(np.array(rows, dtype=np.intp))
 
     def to_cmap(self, colors=None, name="custom_cmap"):
         """Convert to a matplotlib ListedColormap."""
         if colors is None:
-            colors = self.colors
+            return ListedColormap(self.rgb, name=name)
         return ListedColormap([c.hex for c in colors], name=name)
 
+    def to_perceptual_cmap(self, order=None, positions=None, n=256, space="CAM02-UCS",
+                           name="paintkit_perceptual", exact=True):
+        """Build a perceptually uniform colormap through the kit's swatches.
+
+        Uses the stored RGB and perceptual coordinates directly, so the anchors are
+        never formatted to hex and parsed again.
+
+        Args:
+            order: None keeps the kit's order. A list of tags picks one swatch per
+                tag like ``ordered_swatches``. ``"lightness"`` sorts the swatches
+                from dark to light and ``"hue"`` by hue angle in ``space``.
+            positions: Optional anchor positions [0.0, ..., 1.0], one per swatch.
+            n: Number of steps in the output colormap.
+            space: Perceptual color space for interpolation.
+            name: Name for the colormap.
+            exact: False uses the approximate lookup-table conversion.
+
+        Returns:
+            A matplotlib ListedColormap.
+        """
+        kit = self.ordered_swatches(order) if isinstance(order, (list, tuple)) else self
+        coords = kit.perceptual(space)
+        idx = np.arange(len(kit))
+        if order == "lightness":
+            idx = np.argsort(coords[:, 0], kind="stable")
+        elif order == "hue":
+            idx = np.argsort(np.arctan2(coords[:, 2], coords[:, 1]), kind="stable")
+        elif isinstance(order, str):
+            raise ValueError(f"order must be None, a tag list, 'lightness' or 'hue', not {order!r}")
+        if positions is None:
+            positions = np.linspace(0.0, 1.0, len(idx))
+        else:
+            assert len(positions) == len(idx)
+            assert positions[0] == 0.0 and positions[-1] == 1.0
+        lut = colormaps.perceptual_lut(kit.rgb[idx], positions, n, space, exact=exact,
+                                       anchor_coords=coords[idx])
+        return ListedColormap(lut, name=name)
+
     def to_cycler(self, colors=None):
         """Convert to a matplotlib color cycler for axes.prop_cycle."""
         if colors is None:
-            colors = self.colors
+            return cycler(color=self.hexes.tolist())
         return cycler(color=[c.hex for c in colors])
     def display_paintkit(self, color_tags=None, saturation_tags=None, label='hex'):
         """
         Display a grid of swatches by color and saturation tags.
+
+        Use ``render_paintkit`` for the same figure as PNG/SVG bytes without pyplot.
         """
         import matplotlib.pyplot as plt
-        import numpy as np
-        grid_rows = []
-        label_rows = []
-        included = set()
-        if color_tags is None:
-            color_tags = self.color_tags
-        if saturation_tags is None:
-            saturation_tags = sorted({
-                tag for sw in self.colors
-                for tag in sw.tags
-                if tag in {'bright', 'dark', 'muted'}
-            })
-
-        for sat in saturation_tags:
-            row_colors = []
-            row_labels = []
-            for col in color_tags:
-                swatches = self.filter(tags={sat, col}).colors
-                if swatches:
-                    sw = swatches[0]
-                    rgb = hex_to_rgb(sw.hex)
-                    row_colors.append(rgb)
-                    row_labels.append(sw.hex if label == 'hex' else sw.name)
-                    included.update(swatches)
-                else:
-                    row_colors.append((1, 1, 1))
-                    row_labels.append("")
-            grid_rows.append(row_colors)
-            label_rows.append(row_labels)
-
-        grid = np.array(grid_rows)
-        unmatched = [sw for sw in self.colors if sw not in included]
-        if unmatched:
-            n_cols = len(color_tags)*2
-            n_rows = int(np.ceil(len(unmatched) / n_cols))
-            grid_un = np.ones((n_rows, n_cols, 3))
-        else:
-            n_rows = 0
-
-        fig, (ax_grid, ax_unmatched) = plt.subplots(
-            2, 1,
-            figsize=(len(color_tags) * 1.5, max(len(saturation_tags) * 1.2 + n_rows*1.2, 4)),
-            height_ratios=[len(saturation_tags), n_rows/2 if n_rows else 0.5],
-            constrained_layout=True
-        )
-
-        # --- Main Grid Plot ---
-        ax_grid.imshow(grid, aspect='equal')
-
-        for i, row in enumerate(label_rows):
-            for j, text in enumerate(row):
-                if text:
-                    r, g, b = grid[i][j]
-                    brightness = 0.299*r + 0.587*g + 0.114*b
-                    text_color = 'black' if brightness > 0.6 else 'white'
-                    ax_grid.text(j, i, text, ha='center', va='center',
-                                color=text_color, fontsize=7, fontweight='bold')
-
-        ax_grid.set_xticks(range(len(color_tags)))
-        ax_grid.set_xticklabels(color_tags, fontsize=10, rotation=45, ha='right')
-        ax_grid.set_yticks(range(len(saturation_tags)))
-        ax_grid.set_yticklabels(saturation_tags, fontsize=10)
-        ax_grid.set_title("Color Tag (X) vs Saturation Tag (Y)", fontsize=12)
-
-        # --- Unmatched Swatches Plot ---
-        ax_unmatched.axis('off')
-        if unmatched:
-            label_un = [["" for _ in range(n_cols)] for _ in range(n_rows)]
-            for idx, sw in enumerate(unmatched):
-                r, c = divmod(idx, n_cols)
-                grid_un[r, c] = hex_to_rgb(sw.hex)
-                label_un[r][c] = sw.hex if label == 'hex' else sw.name
-            ax_unmatched.imshow(grid_un, aspect='equal')
-            for r in range(n_rows):
-                for c in range(n_cols):
-                    text = label_un[r][c]
-                    if text:
-                        r_val, g_val, b_val = grid_un[r][c]
-                        brightness = 0.299 * r_val + 0.587 * g_val + 0.114 * b_val
-                        text_color = 'black' if brightness > 0.6 else 'white'
-                        ax_unmatched.text(c, r, text, ha='center', va='center',
-                                        color=text_color, fontsize=6, fontweight='bold')
-            ax_unmatched.set_title("Unmatched Swatches", fontsize=12)
+
+        from . import render
+        layout = render.paintkit_layout(self, color_tags, saturation_tags, label)
+        fig = plt.figure(figsize=layout.figsize, constrained_layout=True)
+        render.draw_paintkit(fig, layout)
         plt.show()
 
-def read_colors_from_csv(filename):
+    def render_paintkit(self, color_tags=None, saturation_tags=None, label='hex',
+                        format='png', dpi=100):
+        """Render the ``display_paintkit`` grid headlessly and return PNG/SVG bytes."""
+        from . import render
+        return render.render_paintkit(self, color_tags, saturation_tags, label,
+                                      format=format, dpi=dpi)
+
+    def _repr_png_(self):
+        """Rich display for notebooks; plain ``repr`` never renders."""
+        return self.render_paintkit(label='name')
+
+def read_colors_from_csv(filename, cache=True):
     """Load ColorSwatches from a CSV file.
 
     Args:
         filename: Path to CSV with 'name', 'hex_code', and 'tags' columns.
             Tags should be semicolon-separated.
+        cache: Read and write the compiled cache next to the file
+            (see ``PaintKit.from_file``).
 
     Returns:
         List of ColorSwatch objects.
     """
-    swatches = []
-    with open(filename, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            tags = set(t.strip() for t in row['tags'].split(';') if t.strip())
-            swatches.append(ColorSwatch(name=row['name'], hex_code=row['hex_code'], tags=tags))
-    return swatches
+    return list(PaintKit.from_file(filename, cache=cache).colors)
 
 # --- Colormap creation ---
-def perceptual_colormap_nonuniform(colors, positions=None, n=256, space="CAM02-UCS"):
+def perceptual_colormap_nonuniform(colors, positions=None, n=256, space="CAM02-UCS", exact=True):
     """Create a perceptually uniform colormap with optional custom positions.
 
     Args:
@@ -251,33 +829,13 @@ def perceptual_colormap_nonuniform(colors, positions=None, n=256, space="CAM02-U
         positions: Optional list of positions [0.0, ..., 1.0] for each color.
         n: Number of steps in the output colormap.
         space: Perceptual color space for interpolation.
+        exact: False uses the approximate lookup-table conversion (see plotfair.perceptual).
 
     Returns:
         A matplotlib ListedColormap.
     """
-    num_colors = len(colors)
-    if positions is None:
-        positions = np.linspace(0.0, 1.0, num_colors)
-    else:
-        assert len(colors) == len(positions)
-        assert positions[0] == 0.0 and positions[-1] == 1.0
-    rgb_colors = np.array([to_rgb(c) for c in colors])
-    perceptual_colors = cspace_convert(rgb_colors, "sRGB1", space)
-    steps = np.linspace(0, 1, n)
-    interpolated = []
-    for idx in range(len(positions) - 1):
-        start_pos = positions[idx]
-        end_pos = positions[idx + 1]
-        start_col = perceptual_colors[idx]
-        end_col = perceptual_colors[idx + 1]
-        segment_mask = (steps >= start_pos) & (steps <= end_pos)
-        local_t = (steps[segment_mask] - start_pos) / (end_pos - start_pos)
-        for t in local_t:
-            interpolated.append((1 - t) * start_col + t * end_col)
-    interpolated = np.array(interpolated)
-    rgb_interp = cspace_convert(interpolated, space, "sRGB1")
-    rgb_interp = np.clip(rgb_interp, 0, 1)
-    return ListedColormap(rgb_interp, name="perceptual_nonuniform")
+    return colormaps.perceptual_colormap_nonuniform(colors, positions=positions, n=n, space=space,
+                                                    exact=exact)
 
 def srgb_gradient_colormap(colors, positions=None, n=256, name="srgb_colormap"):
     """Create a gradient colormap using sRGB interpolation.
@@ -317,11 +875,12 @@ def paintkit_to_colorway(paintkit):
     colorway = [c['color'] for c in paintkit.to_cycler()._left]
     return colorway
 
-# --- Build paintkit from CSV and set mpl color cycle ---
+# --- Build paintkit from CSV ---
 try:
     csv_path = os.path.join(os.path.dirname(__file__), 'colorsheet.csv')
-    color_swatches = read_colors_from_csv(csv_path)
-    paintkit = PaintKit(color_swatches)
+    # The bundled sheet is tiny; don't write a cache file into the installed package
+    paintkit = PaintKit.from_file(csv_path, cache=False)
+    color_swatches = paintkit.colors
     use_paintkit = True
 except FileNotFoundError:
     print("colorsheet.csv not found in PridePy directory.")
@@ -339,6 +898,7 @@ if use_paintkit:
              'purple',  'fuchia','yellow', 'teal', 'red']
 
     scheme = paintkit.filter(tags={'bright'}).ordered_swatches(tab10)
-    mpl.rcParams['axes.prop_cycle'] = scheme.to_cycler()  # set default color cycle
     plotly_scheme = paintkit_to_colorway(scheme)
 
+activation.autoactivate("colors")  # set default color cycle
+
@@ -0,0 +1,135 @@
+"""
+plotfair.downsample
+Shape-preserving decimation of long line series for interactive (Plotly) plots.
+
+Browsers stall on line traces with millions of points, and the figure JSON grows with
+every point. ``line_trace`` keeps short series as they are; above ``MAX_POINTS`` it
+switches to WebGL (``go.Scattergl``) and sends a decimated subset of the points:
+
+- ``"minmax"`` (default): split the series into equal-count buckets and keep the minimum
+  and maximum of each, so peaks, dropouts and NaN gaps wider than a bucket survive.
+  Fully vectorized.
+- ``"lttb"``: Largest-Triangle-Three-Buckets, which keeps the visually most significant
+  point per bucket. Long series are pre-reduced with min/max first (MinMaxLTTB), so the
+  per-bucket loop runs over a few points per bucket only.
+
+Both return indices into the original arrays, so x can be of any dtype.
+"""
+
+import numpy as np
+
+# Series longer than this are drawn with WebGL and decimated to at most this many points
+MAX_POINTS = 10_000
+METHODS = ("minmax", "lttb")
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of each of ``n_out // 2`` equal-count buckets.
+
+    The first and last point are always kept; the result is sorted and has at most
+    ``n_out`` entries. NaNs never win a bucket unless the whole bucket is NaN, in
+    which case one of them is kept so the gap stays visible.
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    n_buckets = max((n_out - 2) // 2, 1)
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    pad = n_buckets * size - n
+
+    y = np.asarray(y, dtype=float)
+    missing = np.isnan(y)
+    low = np.concatenate([np.where(missing, np.inf, y), np.full(pad, np.inf)])
+    high = np.concatenate([np.where(missing, -np.inf, y), np.full(pad, -np.inf)])
+    offsets = np.arange(n_buckets) * size
+    i_min = low.reshape(n_buckets, size).argmin(axis=1) + offsets
+    i_max = high.reshape(n_buckets, size).argmax(axis=1) + offsets
+    return np.unique(np.concatenate([[0, n - 1], i_min, i_max]))
+
+
+def _numeric(x):
+    x = np.asarray(x)
+    if x.dtype.kind in "mM":
+        return x.view("i8").astype(float)
+    if x.dtype.kind in "biuf":
+        return x.astype(float, copy=False)
+    return np.arange(len(x), dtype=float)
+
+
+def _lttb(x, y, n_out):
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    # Mean point of every bucket; bucket i is ranked against the mean of bucket i + 1
+    mean_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts, y[-1])
+
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i + 1]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (mean_y[i + 1] - y[a]))
+        a = lo + np.argmax(np.where(np.isnan(area), -1.0, area))
+        out[i + 1] = a
+    return out
+
+
+def lttb_indices(x, y, n_out, minmax_ratio=4):
+    """Indices of the Largest-Triangle-Three-Buckets subset of ``n_out`` points.
+
+    Args:
+        x: Sample positions (numeric, datetime, or anything else, which is treated
+            as evenly spaced).
+        y: Sample values.
+        n_out: Number of points to keep (at least 3).
+        minmax_ratio: Series longer than ``minmax_ratio * n_out`` are first reduced
+            to that many points with ``minmax_indices``; 0 runs LTTB on every point.
+    """
+    n = len(y)
+    if n <= n_out:
+        return np.arange(n)
+    assert n_out >= 3, "LTTB needs at least 3 output points"
+    x, y = _numeric(x), np.asarray(y, dtype=float)
+    if minmax_ratio and n > minmax_ratio * n_out:
+        pre = minmax_indices(y, minmax_ratio * n_out)
+        return pre[_lttb(x[pre], y[pre], n_out)]
+    return _lttb(x, y, n_out)
+
+
+def decimate_indices(x, y, max_points=None, method="minmax"):
+    """Indices of at most ``max_points`` points representing the series (see METHODS)."""
+    max_points = MAX_POINTS if max_points is None else max_points
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+    if method == "lttb":
+        return lttb_indices(x, y, max_points)
+    raise ValueError(f"method must be one of {METHODS}, not {method!r}")
+
+
+def line_trace(x, y, max_points=None, downsample=True, validate=True, **trace_kwargs):
+    """Plotly line trace for ``x`` and ``y`` that stays responsive for long series.
+
+    Args:
+        x, y: The series as arrays.
+        max_points: Length above which the trace is decimated and drawn with WebGL
+            (default: ``MAX_POINTS``).
+        downsample: True or a method name (``"minmax"``, ``"lttb"``) to decimate long
+            series; False always returns a ``go.Scatter`` with every point.
+        validate: False returns the trace as a plain dict (``type="scatter"`` or
+            ``"scattergl"``) without building a validated Plotly object.
+        **trace_kwargs: Passed on to ``go.Scatter`` / ``go.Scattergl``.
+    """
+    max_points = MAX_POINTS if max_points is None else max_points
+    kind = "Scatter"
+    if downsample and len(y) > max_points:
+        kind = "Scattergl"
+        method = "minmax" if downsample is True else downsample
+        idx = decimate_indices(x, y, max_points, method)
+        x, y = np.asarray(x)[idx], np.asarray(y)[idx]
+    if not validate:
+        return dict(type=kind.lower(), x=x, y=y, **trace_kwargs)
+    import plotly.graph_objects as go
+    return getattr(go, kind)(x=x, y=y, **trace_kwargs)
@@ -0,0 +1,178 @@
+"""
+plotfair.export
+Batch export of many matplotlib figures in a process pool.
+
+``export_figures`` takes figures or figure factories plus filenames and saves them in
+worker processes. Each worker switches to the Agg backend and applies the plotfair
+matplotlib presets once, so output matches ``plt.savefig`` with the presets active
+(600 dpi, tight bbox, transparent). Every figure gets an Agg canvas of its own.
+
+Prefer factories (picklable callables returning a Figure, e.g. module-level functions or
+``functools.partial``) over figures: a factory runs inside the worker, while a figure
+has to be pickled in the parent and sent over.
+
+Files are written atomically (temporary file plus ``os.replace``) and folders are
+created race-free, so concurrent exports into the same folder never see partial files.
+"""
+
+import os
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+ExportResult = namedtuple("ExportResult", ["fname", "path", "seconds", "error"])
+
+_PRESET_BACKENDS = ("colors", "matplotlib")
+
+
+def resolve_path(fname, folder="figs"):
+    """Path a figure is saved to, following ``presets.savefig_with_folder``."""
+    return fname if os.path.isabs(fname) else os.path.join(folder, fname)
+
+
+def temporary_path(path):
+    """Unique hidden name next to ``path``, with the same extension, to write into first."""
+    directory, filename = os.path.split(os.path.abspath(path))
+    stem, ext = os.path.splitext(filename)
+    return os.path.join(directory, f".{stem}.{os.getpid()}.{time.monotonic_ns()}.tmp{ext}")
+
+
+def save_atomic(fig, path, **savefig_kwargs):
+    """Save ``fig`` to ``path`` through a temporary file in the same folder.
+
+    The folder is created if needed; concurrent callers creating it at the same time
+    are fine. Readers never observe a partially written file. Like ``savefig``, a path
+    without an extension gets the one of the output format appended.
+
+    Returns:
+        The path the figure was saved to.
+    """
+    import matplotlib as mpl
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if not os.path.splitext(path)[1]:
+        fmt = savefig_kwargs.get("format") or mpl.rcParams["savefig.format"]
+        path = f"{path}.{fmt}"
+        # The temporary name must not decide the format
+        savefig_kwargs["format"] = fmt
+    tmp = temporary_path(path)
+    canvas = fig.canvas
+    if not isinstance(canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+    try:
+        fig.savefig(tmp, **savefig_kwargs)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    finally:
+        if fig.canvas is not canvas:
+            fig.set_canvas(canvas)
+    return path
+
+
+def _init_worker(backends):
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    from . import activation
+    activation.activate(backends=backends)
+
+
+def _export_one(target, fname, folder, savefig_kwargs):
+    """Build (if needed) and save one figure; never raises."""
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+
+    path = resolve_path(fname, folder)
+    start = time.perf_counter()
+    fig = None
+    try:
+        fig = target if isinstance(target, Figure) else target()
+        if fig is None:
+            fig = plt.gcf()
+        path = save_atomic(fig, path, **savefig_kwargs)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        if fig is not None:
+            plt.close(fig)
+    return ExportResult(fname, path, time.perf_counter() - start, error)
+
+
+def _as_jobs(figures, fnames):
+    if fnames is None:
+        if isinstance(figures, dict):
+            return [(target, fname) for fname, target in figures.items()]
+        return list(figures)
+    figures, fnames = list(figures), list(fnames)
+    assert len(figures) == len(fnames), "figures and fnames must have the same length"
+    return list(zip(figures, fnames))
+
+
+def export_figures(figures, fnames=None, folder="figs", workers=None, savefig_kwargs=None,
+                   backends=_PRESET_BACKENDS, max_pending=None, mp_context=None):
+    """Render and save many figures in parallel.
+
+    Args:
+        figures: Figures or zero-argument factories returning a Figure (or drawing
+            on the current pyplot figure and returning None). Alternatively a dict
+            of fname -> figure/factory, or a sequence of (figure/factory, fname)
+            pairs when ``fnames`` is None.
+        fnames: Filenames, one per figure. Relative names are saved inside ``folder``.
+        folder: Output folder for relative filenames (default: "figs").
+        workers: Number of worker processes; None uses ``os.cpu_count()``. 0 saves in
+            the calling process (with the presets applied only for the duration).
+        savefig_kwargs: Extra ``savefig`` arguments, e.g. ``{"dpi": 150}``.
+        backends: plotfair backends activated in every worker.
+        max_pending: Maximum number of jobs submitted but not finished, which bounds
+            the memory held by pickled figures (default: 4 per worker).
+        mp_context: Optional ``multiprocessing`` context, e.g. ``get_context("spawn")``.
+
+    Returns:
+        A list of ``ExportResult(fname, path, seconds, error)`` in input order, where
+        ``error`` is None or the formatted traceback of the failure.
+    """
+    jobs = _as_jobs(figures, fnames)
+    savefig_kwargs = dict(savefig_kwargs or {})
+    # Importing presets would apply them process-wide; if it isn't loaded, saving is on
+    presets = sys.modules.get(f"{__package__}.presets")
+    if presets is not None and not presets.SAVE_FIGS:
+        print('Currently not saving figures')
+        return [ExportResult(fname, resolve_path(fname, folder), 0.0, None)
+                for _, fname in jobs]
+
+    if workers == 0:
+        from . import activation
+        with activation.activate(backends, scope="context"):
+            return [_export_one(target, fname, folder, savefig_kwargs) for target, fname in jobs]
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * workers
+    results = [None] * len(jobs)
+
+    def collect(future, i):
+        try:
+            results[i] = future.result()
+        except Exception:
+            # The job could not be pickled or its worker died
+            fname = jobs[i][1]
+            results[i] = ExportResult(fname, resolve_path(fname, folder), 0.0,
+                                      traceback.format_exc())
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                             initializer=_init_worker, initargs=(backends,)) as pool:
+        pending = {}
+        for i, (target, fname) in enumerate(jobs):
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future, pending.pop(future))
+            pending[pool.submit(_export_one, target, fname, folder, savefig_kwargs)] = i
+        for future, i in pending.items():
+            collect(future, i)
+    return results
@@ -1,29 +1,36 @@
 """Presets and utilities for interplot plotting library.
 
-This module configures default styles, behaviors, and helper classes for
+This module defines default styles, behaviors, and helper classes for
 interplot (iplot) plots. It customizes matplotlib and plotly plot appearances,
 provides enhanced show and save methods, and defines a convenient plotting
 interface via the Iplt class.
+
+The configuration and patches are applied on import (the "interplot" backend of
+plotfair.activation) unless PLOTFAIR_AUTOACTIVATE=0 is set; see plotfair.activate.
 """
 
+import copy
+import os
+import shutil
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
 import interplot as iplot
-import matplotlib as mpl
 import numpy as np
 import plotly.graph_objects as go
 
-mpl.rcParams.update({
+from . import activation, downsample
+
+# Skip re-rendering plots whose content matches the last save (see plotfair.save_cache)
+SAVE_CACHE = False
+
+RC_PARAMS = {
     'figure.figsize': (6, 4),
     'savefig.bbox': 'tight',
     'savefig.transparent': False,
     'savefig.dpi': 'figure'
-})
-
-# iplot.conf.COLOR_CYCLE = pp.plotly_scheme
-iplot.conf.INTERACTIVE = True
-iplot.conf.MPL_FIG_SIZE = (700, 400)
+}
 
 
 def my_mpl_style(fig, ax):
@@ -62,8 +69,6 @@ def my_mpl_style(fig, ax):
     return fig, ax
 
 
-iplot.conf.MPL_CUSTOM_FUNC = my_mpl_style
-
 if iplot.Plot.show.__name__ != 'show_and_close':
     _original_show = iplot.Plot.show
 
@@ -82,19 +87,17 @@ def show_and_close(self):
             self.close()
 
 
-iplot.Plot.show = show_and_close  # ty:ignore[invalid-assignment]
-
 if iplot.Plot.save.__name__ != 'save_with_folder':
     _original_plot_save = iplot.Plot.save
-iplot.conf.SAVE_FIGS = True
-iplot.conf.FIG_FILE = 'figs'
 
 
 def save_with_folder(
     self,
     path,
     *args,
-    folder=iplot.conf.FIG_FILE,
+    folder=None,
+    background=False,
+    cache=None,
     **kwargs,
 ):
     """Save plot to a specified folder, creating it if necessary.
@@ -102,7 +105,12 @@ def save_with_folder(
     Args:
         self: Plot instance.
         path: Filename or boolean for default naming.
-        folder: Folder to save figures into.
+        folder: Folder to save figures into (default: ``iplot.conf.FIG_FILE``).
+        background: Save a snapshot of the plot in a background worker and return
+            a Future instead of blocking (see plotfair.save_queue).
+        cache: Skip the save if the file was written from a plot with the same content
+            and save arguments (see plotfair.save_cache). None uses ``SAVE_CACHE``.
+            Timestamped default names (``path=True``) and folders are never cached.
         *args: Additional positional arguments.
         **kwargs: Additional keyword arguments.
 
@@ -111,36 +119,98 @@ def save_with_folder(
     """
     if not path:
         return
-    folder = Path(folder)
+    folder = Path(iplot.conf.FIG_FILE if folder is None else folder)
     folder.mkdir(parents=True, exist_ok=True)
 
+    # Default names embed the current time, so they are never cached
+    timestamped = isinstance(path, bool)
     # Preserve original semantics
-    if isinstance(path, bool):
+    if timestamped:
         if self.title is not None and str(self.title).strip() != "":
-            return _original_plot_save(
-                self,
-                folder / f"{self.title}_{datetime.now().strftime('%M:%H-%d_%m_%Y')}",
-                *args,
-                **kwargs
-            )
+            path = folder / f"{self.title}_{datetime.now().strftime('%M:%H-%d_%m_%Y')}"
         else:
-            return _original_plot_save(
-                self,
-                folder / datetime.now().strftime("%M:%H-%d_%m_%Y"),
-                *args,
-                **kwargs
-            )
+            path = folder / datetime.now().strftime("%M:%H-%d_%m_%Y")
+    else:
+        path = Path(path)
+
+        # Only redirect relative paths
+        if not path.is_absolute():
+            path = folder / path
+
+    export_format = args[0] if args else kwargs.get("export_format")
+    single = export_format is None or isinstance(export_format, str)
+
+    fingerprint = None
+    # Folders get a title-based name chosen by interplot, so only file paths are cached
+    if (SAVE_CACHE if cache is None else cache) and single and not timestamped \
+            and not path.is_dir():
+        from . import save_cache
+        written = _written_path(self, path, kwargs)
+        save_args = {"args": args, "kwargs": kwargs, "dpi": self.dpi}
+        if isinstance(self.fig, go.Figure):
+            fingerprint = save_cache.plotly_fingerprint(self.fig, **save_args)
+        else:
+            fingerprint = save_cache.figure_fingerprint(self.fig, **save_args)
+        if save_cache.is_fresh(written, fingerprint):
+            return save_cache.completed(written) if background else path
+
+    if background:
+        from . import save_queue
+        save = _save_atomic if single else _original_plot_save
+        result = save_queue.submit(save, _frozen_plot(self), path, *args, **kwargs)
+    else:
+        result = _original_plot_save(self, path, *args, **kwargs)
+    if fingerprint is not None:
+        save_cache.record_when_done(written, fingerprint, result)
+    return result
+
+
+def _written_path(plot, path, kwargs):
+    """The file ``Plot.save`` writes for the file path ``path``.
+
+    ``savefig`` appends the format's extension to a name without one; Plotly writes
+    such names as given.
+    """
+    if path.suffix or isinstance(plot.fig, go.Figure):
+        return path
+    import matplotlib as mpl
+    return path.with_name(f"{path.name}.{kwargs.get('format') or mpl.rcParams['savefig.format']}")
 
-    path = Path(path)
 
-    # Only redirect relative paths
-    if not path.is_absolute():
-        path = folder / path
+def _save_atomic(plot, path, *args, print_confirm=True, **kwargs):
+    """Background-save target: write into a temporary folder, then move the file into place.
 
-    return _original_plot_save(self, path, *args, **kwargs)
+    interplot still picks the file name (title-based for folders, extensions added by
+    the exporter), so the result matches a direct ``Plot.save``.
+    """
+    target = path if path.is_dir() else path.parent
+    target.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".plotfair-", dir=target))
+    try:
+        _original_plot_save(plot, staging if path.is_dir() else staging / path.name,
+                            *args, print_confirm=False, **kwargs)
+        written = []
+        for file in staging.iterdir():
+            os.replace(file, target / file.name)
+            written.append(target / file.name)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    if print_confirm:
+        for file in written:
+            print(f"saved figure at {file}")
+    return written[0] if len(written) == 1 else written
 
 
-iplot.Plot.save = save_with_folder
+def _frozen_plot(plot):
+    """Shallow copy of a Plot whose figure is a detached snapshot, for background saves."""
+    from . import save_queue
+    frozen = copy.copy(plot)
+    if isinstance(plot.fig, go.Figure):
+        frozen.fig = go.Figure(plot.fig)
+    else:
+        frozen.fig = save_queue.thaw_figure(save_queue.freeze_figure(plot.fig))
+    return frozen
+
 
 PLOT_DEFAULTS = {
     "interactive": None,
@@ -163,7 +233,7 @@ PLOT_DEFAULTS = {
     "legend_title": None,
     "legend_togglegroup": None,
     "color_cycle": None,
-    "save_fig": iplot.conf.SAVE_FIGS,
+    "save_fig": True,
     "save_format": None,
     "save_config": None,
     "global_custom_func": None,
@@ -179,8 +249,16 @@ def rebuild_blank(self):
     return self.__class__(**kwargs)
 
 
-iplot.conf.PLOT_DEFAULTS = PLOT_DEFAULTS
-iplot.Plot.clear = rebuild_blank
+# Applied to iplot.conf on activation
+INTERPLOT_CONF = {
+    # "COLOR_CYCLE": pp.plotly_scheme,
+    "INTERACTIVE": True,
+    "MPL_FIG_SIZE": (700, 400),
+    "MPL_CUSTOM_FUNC": my_mpl_style,
+    "SAVE_FIGS": True,
+    "FIG_FILE": 'figs',
+    "PLOT_DEFAULTS": PLOT_DEFAULTS,
+}
 
 
 class Iplt:
@@ -214,7 +292,11 @@ class Iplt:
 
         Optional kwargs: color, linestyle, marker, alpha, label, etc.
 
+        In interactive mode, series longer than ``max_points`` are drawn with WebGL and
+        decimated like ``Plty.plot`` (``downsample=False`` keeps every point).
         """
+        max_points = kwargs.pop("max_points", None)
+        decimate = kwargs.pop("downsample", True)
         if not self.fig.interactive:
             self.fig.fig.gca().plot(*args, **kwargs)
             return
@@ -287,9 +369,9 @@ class Iplt:
 
         mode = "lines+markers" if marker else "lines"
         self.fig.fig.add_trace(
-            go.Scatter(
-                x=x, y=y, mode=mode, name=name,
-                line=line_dict, marker=marker_dict, **kwargs
+            downsample.line_trace(
+                x, y, max_points=max_points, downsample=decimate,
+                mode=mode, name=name, line=line_dict, marker=marker_dict, **kwargs
             )
         )
 
@@ -387,4 +469,12 @@ class Iplt:
         return result
 
 
-iplt = Iplt()
+activation.autoactivate("interplot")
+
+
+def __getattr__(name):
+    """Create the module-level ``iplt`` helper on first access."""
+    if name == "iplt":
+        globals()["iplt"] = Iplt()
+        return globals()["iplt"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,254 @@
+"""
+plotfair.palette_io
+Bulk loading of palette files into the columns behind a PaintKit.
+
+Supported formats, chosen by file extension:
+
+- ``.csv``: columns ``name``, ``hex_code`` and ``tags`` (semicolon-separated).
+- ``.jsonl`` / ``.ndjson``: one object per line with the same keys; ``tags`` may be a
+  semicolon-separated string or a list.
+- ``.parquet`` / ``.pq``: the same columns; ``tags`` may be a string or a list column.
+  Requires the optional ``pyarrow`` dependency.
+
+Rows are parsed in one pass into column arrays; RGB and HSL are computed with one
+vectorized call each and tags are parsed once per distinct tag string. The compiled
+columns are cached in an uncompressed ``.npz`` file next to the source
+(``.<filename>.plotfair.npz``), keyed by the source's modification time and size, so
+later loads skip parsing and conversion entirely. If the directory is not writable the
+cache is silently skipped.
+
+``iter_swatches`` and ``iter_palette_columns`` stream a file in chunks instead, for
+sheets too large to hold in memory as raw rows (see also ``PaintKit.from_iter``).
+"""
+
+import csv
+import itertools
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from . import colors
+
+CACHE_SUFFIX = ".plotfair.npz"
+_CACHE_VERSION = 1
+DEFAULT_CHUNK_SIZE = 65536
+_COLUMNS = ("names", "hexes", "rgb", "hsl", "tag_vocab", "tag_mask")
+
+
+# --- Readers: path -> chunks of (names, hex codes, tags) ---
+# Each reader is a generator; chunk_size=None yields the whole file as one chunk.
+def _read_csv(path, chunk_size=None):
+    with open(path, newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        column = {name: j for j, name in enumerate(header)}
+        while True:
+            block = list(itertools.islice(reader, chunk_size))
+            rows = [row for row in block if row]
+            data = list(zip(*rows)) if rows else [()] * len(header)
+            tags = data[column["tags"]] if "tags" in column else [""] * len(rows)
+            yield data[column["name"]], data[column["hex_code"]], tags
+            if chunk_size is None or len(block) < chunk_size:
+                return
+
+
+def _read_jsonl(path, chunk_size=None):
+    with open(path, encoding="utf-8") as f:
+        while True:
+            block = list(itertools.islice(f, chunk_size))
+            records = [json.loads(line) for line in block if line.strip()]
+            yield ([r["name"] for r in records], [r["hex_code"] for r in records],
+                   [r.get("tags") or "" for r in records])
+            if chunk_size is None or len(block) < chunk_size:
+                return
+
+
+def _read_parquet(path, chunk_size=None):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as err:
+        raise ImportError("Reading Parquet palettes requires pyarrow "
+                          "(pip install pyarrow)") from err
+    if chunk_size is None:
+        batches = [pq.read_table(path)]
+    else:
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+    for batch in batches:
+        tags = (batch.column("tags").to_pylist() if "tags" in batch.schema.names
+                else [""] * batch.num_rows)
+        yield batch.column("name").to_pylist(), batch.column("hex_code").to_pylist(), tags
+
+
+READERS = {
+    ".csv": _read_csv,
+    ".jsonl": _read_jsonl,
+    ".ndjson": _read_jsonl,
+    ".parquet": _read_parquet,
+    ".pq": _read_parquet,
+}
+
+
+def _reader(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported palette format {extension!r}; "
+                         f"choose from {sorted(READERS)}")
+    return READERS[extension]
+
+
+# --- Compilation ---
+def _tag_string(tags):
+    if tags is None:
+        return ""
+    return tags if isinstance(tags, str) else ";".join(tags)
+
+
+def compile_tags(tags):
+    """Build the tag vocabulary and (N, T) tag matrix from per-row tag strings or lists.
+
+    Each distinct tag string is parsed once. The vocabulary is ordered by first
+    appearance (tags sorted within a row), matching ``PaintKit(swatches)``.
+    """
+    keys = np.asarray([_tag_string(t) for t in tags], dtype=str).reshape(-1)
+    unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    parsed = [sorted({t.strip() for t in unique[u].split(";") if t.strip()}) for u in order]
+    vocab = list(dict.fromkeys(tag for tag_list in parsed for tag in tag_list))
+    index = {tag: j for j, tag in enumerate(vocab)}
+    unique_mask = np.zeros((len(unique), len(vocab)), dtype=bool)
+    for u, tag_list in zip(order, parsed):
+        unique_mask[u, [index[tag] for tag in tag_list]] = True
+    return vocab, unique_mask[inverse.reshape(-1)]
+
+
+def _matching_rows(vocab, mask, tags=None, any_tags=None):
+    """Boolean row mask with the semantics of ``PaintKit.filter(tags=..., any_tags=...)``."""
+    index = {tag: j for j, tag in enumerate(vocab)}
+    keep = np.ones(len(mask), dtype=bool)
+    if any_tags:
+        keep &= mask[:, [index[t] for t in any_tags if t in index]].any(axis=1)
+    if tags:
+        if all(t in index for t in tags):
+            keep &= mask[:, [index[t] for t in tags]].all(axis=1)
+        else:
+            keep[:] = False
+    return keep
+
+
+def compile_columns(names, hex_codes, tags, require_tags=None, any_tags=None):
+    """Convert raw name, hex code and tag columns into PaintKit store columns.
+
+    ``require_tags`` and ``any_tags`` drop rows like ``PaintKit.filter(tags=...,
+    any_tags=...)`` before any color conversion is done.
+    """
+    names = np.asarray(names, dtype=str).reshape(-1)
+    hexes = np.asarray(hex_codes, dtype=str).reshape(-1)
+    vocab, mask = compile_tags(tags)
+    if require_tags or any_tags:
+        rows = np.flatnonzero(_matching_rows(vocab, mask, require_tags, any_tags))
+        names, hexes, mask = names[rows], hexes[rows], mask[rows]
+        used = mask.any(axis=0)
+        vocab = [tag for tag, keep in zip(vocab, used) if keep]
+        mask = mask[:, used]
+    hexes = np.char.upper(hexes)
+    rgb = colors.hexes_to_rgb(hexes, dtype=np.float64)
+    return {
+        "names": names,
+        "hexes": hexes,
+        "rgb": rgb,
+        "hsl": colors._rgb_to_hsl_array(rgb),
+        "tag_vocab": vocab,
+        "tag_mask": mask,
+    }
+
+
+# --- Compiled cache ---
+def cache_path(path):
+    """Path of the compiled cache file for a palette file."""
+    directory, filename = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{filename}{CACHE_SUFFIX}")
+
+
+def _cache_key(path):
+    stat = os.stat(path)
+    return np.array([_CACHE_VERSION, stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+
+
+def _load_cache(path, key):
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if not np.array_equal(data["key"], key):
+                return None
+            columns = {name: data[name] for name in _COLUMNS}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    columns["tag_vocab"] = columns["tag_vocab"].tolist()
+    return columns
+
+
+def _store_cache(path, key, columns):
+    """Write the cache atomically; give up silently if the directory is read-only."""
+    arrays = dict(columns, tag_vocab=np.asarray(columns["tag_vocab"], dtype=str))
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, key=key, **arrays)
+        os.chmod(tmp, 0o644)  # mkstemp creates the file private to the current user
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def read_palette_columns(path, cache=True):
+    """Load a palette file into PaintKit store columns.
+
+    Args:
+        path: Path to a ``.csv``, ``.jsonl``/``.ndjson`` or ``.parquet``/``.pq`` file.
+        cache: Read and write the compiled ``.npz`` cache next to the file.
+
+    Returns:
+        Dict with ``names``, ``hexes``, ``rgb``, ``hsl``, ``tag_vocab`` and ``tag_mask``.
+    """
+    reader = _reader(path)
+    key = _cache_key(path)
+    compiled = cache_path(path)
+    if cache:
+        columns = _load_cache(compiled, key)
+        if columns is not None:
+            return columns
+    columns = compile_columns(*next(reader(path)))
+    if cache:
+        _store_cache(compiled, key, columns)
+    return columns
+
+
+# --- Streaming ---
+def iter_palette_columns(path, chunk_size=DEFAULT_CHUNK_SIZE, tags=None, any_tags=None):
+    """Yield store columns for successive chunks of ``chunk_size`` rows of a palette file.
+
+    Only one chunk of raw rows is held at a time. Rows rejected by ``tags`` (all must be
+    present) or ``any_tags`` (at least one) are dropped before color conversion.
+    """
+    for raw in _reader(path)(path, chunk_size):
+        yield compile_columns(*raw, require_tags=tags, any_tags=any_tags)
+
+
+def iter_swatches(path, chunk_size=DEFAULT_CHUNK_SIZE, tags=None, any_tags=None):
+    """Lazily yield the ColorSwatches of a palette file.
+
+    The file is read and converted ``chunk_size`` rows at a time, so memory does not
+    grow with the file. ``tags`` and ``any_tags`` filter rows as in ``PaintKit.filter``.
+    """
+    for columns in iter_palette_columns(path, chunk_size, tags=tags, any_tags=any_tags):
+        store = colors._SwatchStore(**columns)
+        for i in range(len(store)):
+            yield store.swatch(i)
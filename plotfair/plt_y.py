@@ -1,7 +1,8 @@
 """This module provides a Matplotlib-like plotting interface using Plotly as the backend.
 It defines the Plty class which mimics familiar Matplotlib plotting functions such as plot,
 hist, setting axis limits, titles, labels, and supports log-log scaling. The module also
-includes predefined Plotly templates and themes for consistent styling."""
+includes predefined Plotly templates and themes for consistent styling, registered with
+plotly.io on import unless PLOTFAIR_AUTOACTIVATE=0 is set (see plotfair.activate)."""
 
 import subprocess
 import tempfile
@@ -10,7 +11,13 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.io as pio
 
-from . import colors
+from . import activation, colors, downsample, resample
+
+try:
+    # Private Plotly helper; without it arrays are sent as plain lists
+    from _plotly_utils.utils import to_typed_array_spec
+except ImportError:
+    to_typed_array_spec = None
 
 
 class Plty:
@@ -19,9 +26,27 @@ class Plty:
     This class provides methods similar to Matplotlib's pyplot interface, enabling users
     to create line plots, histograms, set axis limits, labels, titles, and switch between
     linear and log-log scales, all using Plotly's interactive plotting capabilities.
+
+    With ``dynamic=True``, decimated line traces keep their full-resolution data in the
+    kernel and ``show()`` displays a FigureWidget that re-decimates the visible x-range
+    on every zoom (see plotfair.resample; requires anywidget).
+
+    With ``builder=True``, ``fig`` is a ``FigureBuilder``: traces and layout updates are
+    collected as plain dicts and only serialized (without Plotly's property validation)
+    by ``show()`` and the export methods. ``figure()`` builds a validated ``go.Figure``.
     """
-    def __init__(self):
-        self.fig = go.Figure()
+    def __init__(self, dynamic=False, builder=False):
+        self.dynamic = dynamic
+        self.builder = builder
+        self.fig = self._new_figure()
+        self._series = {}
+
+    def _new_figure(self):
+        return FigureBuilder() if self.builder else go.Figure()
+
+    def figure(self):
+        """The current figure as a ``go.Figure``."""
+        return self.fig.to_figure() if self.builder else self.fig
 
     def plot(self, *args, **kwargs):
         """
@@ -32,7 +57,14 @@ class Plty:
         - plot(x, y)
         - plot(x, y, fmt)
         Optional keyword arguments include color, linestyle, marker, alpha, label, etc.
+
+        Series longer than ``max_points`` (default: ``downsample.MAX_POINTS``) are drawn
+        with WebGL and decimated to that many points, keeping each bucket's minimum and
+        maximum. Pass ``downsample="lttb"`` for LTTB decimation, or ``downsample=False``
+        to plot every point with ``go.Scatter``.
         """
+        max_points = kwargs.pop("max_points", None)
+        decimate = kwargs.pop("downsample", True)
         fmt = None
         if len(args) == 1:  # y only
             y = np.asarray(args[0])
@@ -84,19 +116,55 @@ class Plty:
             marker_dict["symbol"] = marker
             marker_dict["size"] = 8
 
-        self.fig.add_trace(go.Scatter(x=x, y=y, mode="lines+markers" if marker else "lines",
-                                     name=name, line=line_dict, marker=marker_dict, **kwargs))
-
-    def hist(self, data, bins=50, **kwargs):
+        trace = downsample.line_trace(
+            x, y, max_points=max_points, downsample=decimate,
+            mode="lines+markers" if marker else "lines",
+            name=name, line=line_dict, marker=marker_dict, validate=not self.builder, **kwargs)
+        kind = trace["type"] if self.builder else trace.type
+        if self.dynamic and kind == "scattergl":  # the trace was decimated
+            method = "minmax" if decimate is True else decimate
+            series = resample.SortedSeries(x, y, max_points, method)
+            if series.numeric:
+                self._series[len(self.fig.data)] = series
+        self.fig.add_trace(trace)
+
+    def hist(self, data, bins=50, precompute=None, **kwargs):
         """
         Plot histograms similar to plt.hist.
 
         Data can be a list, numpy array, or a dictionary of {label: values}.
         Bins can be an integer or an array of bin edges.
         Supports density=True for normalized histograms.
+
+        With ``precompute=True`` the counts are computed here with ``np.histogram`` and
+        drawn as one bar per bin, so the figure holds the bins instead of the samples;
+        the traces of a dict share one set of edges spanning all of them. None (default)
+        precomputes when there are more than ``downsample.MAX_POINTS`` samples.
         """
         opacity = kwargs.pop("alpha", 0.5)
         density = kwargs.pop("density", False)
+        if isinstance(data, dict):
+            items = list(data.items())
+        else:
+            items = [(kwargs.pop("label", "trace"), data)]
+        if precompute is None:
+            precompute = sum(np.size(values) for _, values in items) > downsample.MAX_POINTS
+
+        if precompute:
+            arrays = [(label, np.asarray(values).ravel()) for label, values in items]
+            if isinstance(bins, int):
+                present = [arr for _, arr in arrays if len(arr)]
+                lo = min((np.nanmin(arr) for arr in present), default=0.0)
+                hi = max((np.nanmax(arr) for arr in present), default=1.0)
+                edges = np.histogram_bin_edges([], bins=bins, range=(lo, hi))
+            else:
+                edges = np.asarray(bins)
+            for label, arr in arrays:
+                heights = histogram_heights(arr, edges, density)
+                self.fig.add_trace(histogram_bar(edges, heights, name=label, opacity=opacity,
+                                                 validate=not self.builder))
+            self.fig.update_layout(barmode='overlay')
+            return
 
         def add_hist_trace(arr, label=None):
             # Compute bin edges using matplotlib method
@@ -106,7 +174,8 @@ class Plty:
                 edges = np.asarray(bins)
 
             self.fig.add_trace(
-                go.Histogram(
+                _trace(
+                    "Histogram", validate=not self.builder,
                     x=arr,
                     # copies mpl hist behavoiour
                     xbins=dict(
@@ -120,28 +189,30 @@ class Plty:
                 )
             )
 
-        if isinstance(data, dict):
-            for label, values in data.items():
-                add_hist_trace(values, label=label)
-        else:
-            add_hist_trace(data, label=kwargs.pop("label", "trace"))
+        for label, values in items:
+            add_hist_trace(values, label=label)
 
         self.fig.update_layout(barmode='overlay')
 
+    def _axis_range(self, axis):
+        if self.builder:
+            return self.fig.layout.get(axis, {}).get("range")
+        return self.fig.layout[axis].range
+
     def xlim(self, xmin=None, xmax=None):
         """Set the limits of the x-axis."""
-        current = self.fig.layout.xaxis
+        current = self._axis_range("xaxis")
         new_range = [
-            xmin if xmin is not None else current.range[0] if current.range else None,
-            xmax if xmax is not None else current.range[1] if current.range else None
+            xmin if xmin is not None else current[0] if current else None,
+            xmax if xmax is not None else current[1] if current else None
         ]
         self.fig.update_layout(xaxis=dict(range=new_range))
     def ylim(self, ymin=None, ymax=None):
         """Set the limits of the y-axis."""
-        current = self.fig.layout.yaxis
+        current = self._axis_range("yaxis")
         new_range = [
-            ymin if ymin is not None else current.range[0] if current.range else None,
-            ymax if ymax is not None else current.range[1] if current.range else None
+            ymin if ymin is not None else current[0] if current else None,
+            ymax if ymax is not None else current[1] if current else None
         ]
         self.fig.update_layout(yaxis=dict(range=new_range))
     def title(self, text):
@@ -170,14 +241,380 @@ class Plty:
             # Copy to clipboard using impbcopy
             subprocess.run(["impbcopy", tmp.name])
 
+    def widget(self):
+        """The figure as a FigureWidget that resamples its long traces on zoom."""
+        return resample.resampling_widget(self.figure(), self._series)
+
     def show(self):
         """Display the figure and reset the figure object."""
-        self.fig.show()
-        self.fig = go.Figure()
+        if self.dynamic:
+            from IPython.display import display
+            display(self.widget())
+        else:
+            self.fig.show()
+        self.fig = self._new_figure()
+        self._series = {}
 
     def show_(self):
         # self.fig.show()
-        self.fig = go.Figure()
+        self.fig = self._new_figure()
+        self._series = {}
+
+# --- Validation-free figures ---
+# Plotly property names never contain underscores except these, so every other
+# underscore in a key is a magic underscore
+_UNDERSCORE_PROPERTIES = tuple(getattr(
+    go.Figure, "_valid_underscore_properties",
+    ("copy_xstyle", "copy_ystyle", "copy_zstyle", "error_x", "error_y", "error_z",
+     "paper_bgcolor", "plot_bgcolor"),
+))
+_templates = {}
+
+
+def _trace(kind, validate=True, **props):
+    """A validated ``go.<kind>`` trace, or the same trace as a plain dict for FigureBuilder."""
+    return getattr(go, kind)(**props) if validate else dict(type=kind.lower(), **props)
+
+
+def _update_nested(target, updates):
+    """Merge ``updates`` into the dict ``target`` like ``update_layout``.
+
+    Handles magic underscores (``xaxis_title``) and string titles, and skips None values
+    and empty dicts, which Plotly drops as well.
+    """
+    for key, value in updates.items():
+        head, rest = _split_key(key)
+        if rest:
+            key, value = head, {rest: value}
+        elif key == "title" and isinstance(value, str):
+            value = {"text": value}
+        if isinstance(value, (list, tuple)) and value and isinstance(value[0], dict):
+            # Arrays of objects (annotations, shapes, ...) take magic underscores as well
+            value = [_update_nested({}, item) if isinstance(item, dict) else item
+                     for item in value]
+        if isinstance(value, dict):
+            nested = target.get(key, {})
+            _update_nested(nested, value)
+            if nested:
+                target[key] = nested
+        elif value is not None:
+            target[key] = value
+    return target
+
+
+def _split_key(key):
+    """Split ``"xaxis_title_text"`` into ``("xaxis", "title_text")``."""
+    for name in _UNDERSCORE_PROPERTIES:
+        if key == name or key.startswith(f"{name}_"):
+            return name, key[len(name) + 1:]
+    head, _, rest = key.partition("_")
+    return head, rest
+
+
+def _template_json():
+    """The default Plotly template as a dict, merged once per setting instead of per figure."""
+    name = pio.templates.default
+    if not isinstance(name, str):
+        return name.to_plotly_json() if name is not None else {}
+    # Keyed by the registered objects too, so re-registering a template is picked up
+    key = (name, tuple(id(pio.templates[part]) for part in name.split("+")))
+    if key not in _templates:
+        _templates.clear()
+        _templates[key] = pio.templates[name].to_plotly_json()
+    return _templates[key]
+
+
+def _encode(value):
+    """NumPy arrays as Plotly typed-array specs (base64), like ``go.Figure`` serializes them."""
+    if isinstance(value, np.ndarray):
+        return to_typed_array_spec(value) if to_typed_array_spec else value.tolist()
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+class FigureBuilder:
+    """Plotly figure collected as plain dicts and serialized without validation.
+
+    Implements the part of ``go.Figure`` that ``Plty`` uses (``add_trace``,
+    ``update_layout``, ``data``, ``layout``, ``show`` and the ``to_*`` / ``write_*``
+    exports). Traces are dicts with a ``type`` key, or ``go`` traces, which are converted.
+    The default template is added to the layout when the figure is serialized.
+    """
+
+    def __init__(self):
+        self.data = []
+        self.layout = {}
+
+    def add_trace(self, trace):
+        """Append a trace dict (or a ``go`` trace)."""
+        if not isinstance(trace, dict):
+            trace = trace.to_plotly_json()
+        cleaned = {}
+        _update_nested(cleaned, trace)
+        self.data.append(cleaned)
+        return self
+
+    def update_layout(self, dict1=None, **kwargs):
+        """Merge layout properties, like ``go.Figure.update_layout``."""
+        _update_nested(self.layout, {**(dict1 or {}), **kwargs})
+        return self
+
+    def to_dict(self):
+        """The figure as a plain dict, ready for ``plotly.io`` with ``validate=False``."""
+        layout = _encode(self.layout)
+        layout.setdefault("template", _template_json())
+        return {"data": [_encode(trace) for trace in self.data], "layout": layout}
+
+    def to_figure(self):
+        """A validated ``go.Figure`` with the same content."""
+        return go.Figure(self.to_dict())
+
+    def to_json(self, **kwargs):
+        return pio.to_json(self.to_dict(), validate=False, **kwargs)
+
+    def show(self, *args, **kwargs):
+        pio.show(self.to_dict(), *args, validate=False, **kwargs)
+
+    def write_html(self, file, **kwargs):
+        pio.write_html(self.to_dict(), file, validate=False, **kwargs)
+
+    def write_image(self, file, **kwargs):
+        pio.write_image(self.to_dict(), file, validate=False, **kwargs)
+
+
+def histogram_heights(arr, edges, density=False):
+    """Bin heights of ``arr`` for ``edges`` like ``np.histogram``, NaNs ignored.
+
+    Edges that are exactly ``np.linspace(edges[0], edges[-1], len(edges))`` use NumPy's
+    fast path for uniform bins, which bins against those same edges. Any other edges,
+    even nearly uniform ones, are searched directly.
+    """
+    arr = np.asarray(arr).ravel()
+    arr = arr[~np.isnan(arr)] if arr.dtype.kind == "f" else arr
+    edges = np.asarray(edges)
+    widths = np.diff(edges)
+    if len(edges) > 2 and np.array_equal(edges, np.linspace(edges[0], edges[-1], len(edges))):
+        counts, _ = np.histogram(arr, bins=len(widths), range=(edges[0], edges[-1]))
+    else:
+        counts, _ = np.histogram(arr, bins=edges)
+    if density:
+        total = counts.sum()
+        return counts / (total * widths) if total else counts.astype(float)
+    return counts
+
+
+def histogram_bar(edges, heights, name=None, opacity=0.5, validate=True, **kwargs):
+    """A ``go.Bar`` drawing precomputed histogram ``heights`` as gapless bins."""
+    edges = np.asarray(edges)
+    return _trace(
+        "Bar", validate=validate,
+        x=edges[:-1], y=heights, width=np.diff(edges), offset=0,
+        customdata=edges[1:], name=name, opacity=opacity,
+        hovertemplate="[%{x}, %{customdata})<br>%{y}",
+        **kwargs,
+    )
+
+
+# --- Streaming accumulators ---
+def _doublings(lo, width, n, vmin, vmax):
+    """Yield (grows_up, lo, width) steps until [lo, lo + n * width) covers vmin..vmax.
+
+    Each step doubles the bin width and keeps the number of bins, so the old bins merge
+    pairwise into one half of the new grid.
+    """
+    while vmin < lo or vmax >= lo + n * width:
+        up = vmin >= lo
+        if not up:
+            lo -= n * width
+        width *= 2
+        yield up, lo, width
+
+
+class StreamingHistogram:
+    """Histogram accumulated chunk by chunk, in O(bins) memory.
+
+    Args:
+        bins: Number of bins, or an array of fixed bin edges.
+        range: (lo, hi) for fixed, evenly spaced edges. Without a range (and with
+            integer ``bins``), the edges start at the span of the first chunk and extend
+            when later values fall outside: the bin width doubles, neighbouring bins
+            merge, and the number of bins (which must be even) stays the same.
+
+    Values outside fixed edges are counted in ``underflow`` / ``overflow``; NaNs and
+    infinities are skipped.
+    """
+
+    def __init__(self, bins=50, range=None):
+        self.auto = range is None and isinstance(bins, int)
+        if self.auto:
+            assert bins % 2 == 0, "auto-extending histograms need an even number of bins"
+            self.edges = None
+        elif isinstance(bins, int):
+            self.edges = np.histogram_bin_edges([], bins=bins, range=range)
+        else:
+            self.edges = np.asarray(bins, dtype=float)
+        self.n_bins = bins if isinstance(bins, int) else len(self.edges) - 1
+        self.counts = np.zeros(self.n_bins, dtype=np.int64)
+        self.underflow = self.overflow = 0
+        self.total = 0
+
+    def update(self, chunk):
+        """Add the values of ``chunk`` to the histogram."""
+        chunk = np.asarray(chunk, dtype=float).ravel()
+        chunk = chunk[np.isfinite(chunk)]
+        if not len(chunk):
+            return self
+        self.total += len(chunk)
+        vmin, vmax = chunk.min(), chunk.max()
+        if self.auto:
+            self._cover(vmin, vmax)
+        else:
+            self.underflow += int(np.count_nonzero(chunk < self.edges[0]))
+            self.overflow += int(np.count_nonzero(chunk > self.edges[-1]))
+        self.counts += histogram_heights(chunk, self.edges)
+        return self
+
+    def _cover(self, vmin, vmax):
+        if self.edges is None:
+            lo, hi = (vmin, vmax) if vmax > vmin else (vmin - 0.5, vmin + 0.5)
+            # Open upper end: the maximum must fall inside the last bin, not on its edge
+            width = (hi - lo) / self.n_bins * (1 + 1e-9)
+            self.edges = lo + width * np.arange(self.n_bins + 1)
+            return
+        lo, width = self.edges[0], self.edges[1] - self.edges[0]
+        half = self.n_bins // 2
+        for up, lo, width in _doublings(lo, width, self.n_bins, vmin, vmax):
+            merged = self.counts.reshape(half, 2).sum(axis=1)
+            self.counts = np.zeros_like(self.counts)
+            if up:
+                self.counts[:half] = merged
+            else:
+                self.counts[half:] = merged
+            self.edges = lo + width * np.arange(self.n_bins + 1)
+
+    def heights(self, density=False):
+        """Bin heights: counts, or a probability density like ``np.histogram``."""
+        if not density:
+            return self.counts.copy()
+        total = self.counts.sum()
+        return self.counts / (total * np.diff(self.edges)) if total else self.counts.astype(float)
+
+    def plot(self, target=None, label=None, alpha=0.5, density=False):
+        """Draw the histogram as bars into the Plty ``target`` (default: ``plty``)."""
+        target = target or plty
+        if self.edges is not None:
+            target.fig.add_trace(histogram_bar(self.edges, self.heights(density), name=label,
+                                               opacity=alpha, validate=not target.builder))
+            target.fig.update_layout(barmode='overlay')
+        return target
+
+
+class StreamingLine:
+    """Line series accumulated chunk by chunk, in O(max_points) memory.
+
+    The x-axis is divided into ``max_points // 2`` equal-width buckets, each keeping
+    its minimum and maximum sample. When new samples fall beyond the covered span, the
+    bucket width doubles and neighbouring buckets merge, so the whole history stays
+    evenly resolved. Peaks, dropouts and the first and last sample are never lost; NaN
+    values are skipped.
+
+    Args:
+        max_points: Maximum number of points kept and drawn
+            (default: ``downsample.MAX_POINTS``).
+    """
+
+    def __init__(self, max_points=None):
+        max_points = downsample.MAX_POINTS if max_points is None else max_points
+        self.max_points = max_points
+        self.n_buckets = max((max_points - 2) // 4 * 2, 2)
+        self.lo = self.width = None
+        self.ends = None  # the samples with the smallest and largest x: [[x0, y0], [x1, y1]]
+        self.x_dtype = None
+        self.total = 0
+        n = self.n_buckets
+        self.min_y, self.max_y = np.full(n, np.inf), np.full(n, -np.inf)
+        self.min_x, self.max_x = np.full(n, np.nan), np.full(n, np.nan)
+
+    def update(self, *args):
+        """Add samples: ``update(y)`` (x continues from the previous chunk) or ``update(x, y)``."""
+        if len(args) == 1:
+            y = np.asarray(args[0], dtype=float).ravel()
+            x = np.arange(self.total, self.total + len(y), dtype=float)
+        else:
+            x, y = np.asarray(args[0]).ravel(), np.asarray(args[1], dtype=float).ravel()
+            assert len(x) == len(y), "x and y must have the same length"
+            if x.dtype.kind in "mM":
+                self.x_dtype = x.dtype
+                x = x.view("i8")
+            x = x.astype(float)
+        self.total += len(y)
+        keep = ~np.isnan(y) & np.isfinite(x)
+        x, y = x[keep], y[keep]
+        if not len(y):
+            return self
+        i, j = np.argmin(x), np.argmax(x)
+        if self.ends is None:
+            self.ends = np.array([[x[i], y[i]], [x[j], y[j]]])
+        if x[i] < self.ends[0, 0]:
+            self.ends[0] = x[i], y[i]
+        if x[j] >= self.ends[1, 0]:
+            self.ends[1] = x[j], y[j]
+        self._cover(x[i], x[j])
+
+        bucket = np.clip((x - self.lo) // self.width, 0, self.n_buckets - 1).astype(np.intp)
+        # Sorted by bucket, then value: the first / last entry of a bucket is its min / max
+        order = np.lexsort((y, bucket))
+        b, first = np.unique(bucket[order], return_index=True)
+        last = np.append(first[1:], len(order)) - 1
+        for values, xs, winner, better in ((self.min_y, self.min_x, order[first], np.less),
+                                           (self.max_y, self.max_x, order[last], np.greater)):
+            wins = better(y[winner], values[b])
+            values[b[wins]] = y[winner[wins]]
+            xs[b[wins]] = x[winner[wins]]
+        return self
+
+    def _cover(self, vmin, vmax):
+        if self.lo is None:
+            self.lo = vmin
+            self.width = max((vmax - vmin) / self.n_buckets * (1 + 1e-9), 1e-12)
+        half = self.n_buckets // 2
+        for up, lo, width in _doublings(self.lo, self.width, self.n_buckets, vmin, vmax):
+            self.lo, self.width = lo, width
+            target = slice(None, half) if up else slice(half, None)
+            for values, xs, arg, fill in ((self.min_y, self.min_x, np.argmin, np.inf),
+                                          (self.max_y, self.max_x, np.argmax, -np.inf)):
+                pairs = values.reshape(half, 2)
+                choice = arg(pairs, axis=1)
+                merged_v = pairs[np.arange(half), choice]
+                merged_x = xs.reshape(half, 2)[np.arange(half), choice]
+                values[:], xs[:] = fill, np.nan
+                values[target], xs[target] = merged_v, merged_x
+
+    def data(self):
+        """The accumulated (x, y) points in x order, at most ``max_points`` of them."""
+        if self.ends is None:
+            return np.array([]), np.array([])
+        filled = np.isfinite(self.min_y)
+        x = np.concatenate([self.ends[:, 0], self.min_x[filled], self.max_x[filled]])
+        y = np.concatenate([self.ends[:, 1], self.min_y[filled], self.max_y[filled]])
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+        # Samples stored twice (single-sample buckets, the end points)
+        keep = np.ones(len(x), dtype=bool)
+        keep[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+        x, y = x[keep], y[keep]
+        if self.x_dtype is not None:
+            x = np.round(x).astype(np.int64).view(self.x_dtype)
+        return x, y
+
+    def plot(self, target=None, *args, **kwargs):
+        """Draw the line into the Plty ``target`` (default: ``plty``) with ``Plty.plot``."""
+        target = target or plty
+        kwargs.setdefault("max_points", self.max_points)
+        target.plot(*self.data(), *args, **kwargs)
+        return target
+
 
 # Define Plotly Themes
 # 1. Font definitions
@@ -235,11 +672,16 @@ pridepy_base_template = dict(
 loglog_template = dict(xaxis_type='log', yaxis_type='log',)
 
 
-pio.templates["pridepy"] = go.layout.Template(layout=pridepy_base_template)
-pio.templates["loglog"] = go.layout.Template(layout=loglog_template)
+TEMPLATES = {
+    "pridepy": go.layout.Template(layout=pridepy_base_template),
+    "loglog": go.layout.Template(layout=loglog_template),
+}
 # use plotly_white for paper graphs or plotly_dark for dark mode or plotly for default
 # presentation makes lines slighlty thicker
-pio.templates.default = 'plotly_white+presentation+pridepy'
+DEFAULT_TEMPLATE = 'plotly_white+presentation+pridepy'
+
+# Registers TEMPLATES and sets DEFAULT_TEMPLATE (the "plotly" backend of plotfair.activation)
+activation.autoactivate("plotly")
 
 # Usage
 plty = Plty()
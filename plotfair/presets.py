@@ -2,24 +2,27 @@
 plotfair.presets
 
 This module defines default plotting settings for matplotlib and seaborn to ensure
-consistent and visually appealing figures across the project. It updates matplotlib's
-rcParams with preferred defaults, applies a seaborn style, and monkey-patches
-matplotlib.pyplot.savefig with a wrapper that saves figures to a specified folder by default.
+consistent and visually appealing figures across the project. It defines matplotlib
+rcParams with preferred defaults, a seaborn style, and a matplotlib.pyplot.savefig wrapper
+that saves figures to a specified folder by default.
+
+Importing the module applies these presets (the "matplotlib" backend of
+plotfair.activation) unless PLOTFAIR_AUTOACTIVATE=0 is set; see plotfair.activate.
 #TODO: Create Style with https://matplotlib.org/stable/users/explain/customizing.html
 """
 import os
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
-import seaborn as sns
 
-SAVE_FIGS = True
+from . import activation
 
-# Seaborn base style
-sns.set_style("white")
+SAVE_FIGS = True
+# Skip re-rendering figures whose content matches the last save (see plotfair.save_cache)
+SAVE_CACHE = False
 
-# Update rcParams
-mpl.rcParams.update({
+# rcParams defaults
+RC_PARAMS = {
     'figure.figsize': (6, 4),
     'figure.dpi': 150,
     'figure.facecolor': 'white',
@@ -60,18 +63,20 @@ mpl.rcParams.update({
     'savefig.transparent': True,
     'image.cmap': 'plasma',
     "errorbar.capsize" : 2.0,
-})
+}
 
-sns.set_style("white", {
+# Seaborn base style, applied on top of RC_PARAMS
+SEABORN_STYLE = "white"
+SEABORN_STYLE_RC = {
     "axes.spines.right": False,
     "axes.spines.top": False,
     "xtick.bottom": True,
     "ytick.left": True
-})
+}
 
 _original_savefig = plt.savefig
 
-def savefig_with_folder(fname, *args, folder="figs", **kwargs):
+def savefig_with_folder(fname, *args, folder="figs", background=False, cache=None, **kwargs):
     """
     Save a matplotlib figure to a file, ensuring the output directory exists.
 
@@ -80,6 +85,10 @@ def savefig_with_folder(fname, *args, folder="figs", **kwargs):
             it will be saved inside the specified folder.
         *args: Additional positional arguments passed to plt.savefig.
         folder (str): The folder to save the figure in (default: "figs").
+        background (bool): Save a snapshot of the current figure in a background
+            worker and return a Future instead of blocking (see plotfair.save_queue).
+        cache (bool): Skip the save if the file was written from a figure with the same
+            content and save arguments (see plotfair.save_cache). None uses SAVE_CACHE.
         **kwargs: Additional keyword arguments passed to plt.savefig.
 
     Behavior:
@@ -91,8 +100,27 @@ def savefig_with_folder(fname, *args, folder="figs", **kwargs):
         if not os.path.isabs(fname):
             os.makedirs(folder, exist_ok=True)
             fname = os.path.join(folder, fname)
-        return _original_savefig(fname, *args, **kwargs)
+        if background and args:
+            raise TypeError("savefig(background=True) accepts keyword arguments only")
+        if not os.path.splitext(fname)[1]:
+            # savefig appends the format's extension; the cache and background saves
+            # need the final name up front
+            fname = f"{fname}.{kwargs.get('format') or mpl.rcParams['savefig.format']}"
+        fingerprint = None
+        if SAVE_CACHE if cache is None else cache:
+            from . import save_cache
+            fingerprint = save_cache.figure_fingerprint(plt.gcf(), args=args, kwargs=kwargs)
+            if save_cache.is_fresh(fname, fingerprint):
+                return save_cache.completed(fname) if background else None
+        if background:
+            from . import save_queue
+            result = save_queue.savefig(plt.gcf(), fname, **kwargs)
+        else:
+            result = _original_savefig(fname, *args, **kwargs)
+        if fingerprint is not None:
+            save_cache.record_when_done(fname, fingerprint, result)
+        return result
     else:
         print('Currently not saving figures')
 
-plt.savefig = savefig_with_folder
+activation.autoactivate("matplotlib")
@@ -0,0 +1,197 @@
+"""
+plotfair.render
+Headless rendering of PaintKits and colormaps to PNG or SVG bytes.
+
+Figures are built directly as ``matplotlib.figure.Figure`` objects on an Agg canvas,
+never through pyplot: nothing is registered with the pyplot figure manager and no GUI
+backend is involved, so rendering is safe in CI, worker threads and report pipelines.
+
+- ``render_paintkit``: the ``display_paintkit`` tag grid.
+- ``render_colormap``: the ``show_colormap`` gradient bar.
+- ``render_sheet``: many palettes and colormaps as strips in one figure. The strips
+  are composed into a single image, so the cost hardly grows with the number of swatches.
+"""
+
+import io
+from collections import namedtuple
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import Colormap, to_rgba_array
+from matplotlib.figure import Figure
+
+PaintKitLayout = namedtuple(
+    "PaintKitLayout",
+    ["color_tags", "saturation_tags", "grid", "labels", "unmatched_grid", "unmatched_labels",
+     "figsize", "height_ratios"],
+)
+
+
+# --- Figures ---
+def new_figure(figsize, **kwargs):
+    """Create a Figure on its own Agg canvas, outside pyplot."""
+    fig = Figure(figsize=figsize, **kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def figure_bytes(fig, format="png", dpi=100, **kwargs):
+    """Encode a figure as PNG, SVG or any other format savefig supports."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format=format, dpi=dpi, **kwargs)
+    return buf.getvalue()
+
+
+# --- PaintKit grid ---
+def paintkit_layout(kit, color_tags=None, saturation_tags=None, label="hex"):
+    """Arrange a kit's swatches by color tag (columns) and saturation tag (rows).
+
+    The first swatch of each (saturation, color) cell is shown in the grid; swatches
+    that fall in no cell are collected in a second grid of unmatched swatches.
+    """
+    store = kit._store
+    labels = store.hexes if label == "hex" else store.names
+    if color_tags is None:
+        color_tags = kit.color_tags
+    if saturation_tags is None:
+        saturation_tags = sorted(
+            tag for tag in {"bright", "dark", "muted"} if len(store.tag_rows(tag))
+        )
+
+    grid = np.ones((len(saturation_tags), len(color_tags), 3))
+    label_rows = [["" for _ in color_tags] for _ in saturation_tags]
+    included = np.zeros(len(store), dtype=bool)
+    for i, sat in enumerate(saturation_tags):
+        for j, col in enumerate(color_tags):
+            cell = store.rows_with_all((sat, col))
+            if len(cell):
+                first = cell[0]
+                grid[i, j] = store.rgb[first]
+                label_rows[i][j] = labels[first]
+                included[cell] = True
+
+    unmatched = np.flatnonzero(~included)
+    grid_un, label_un = None, None
+    n_rows = 0
+    if len(unmatched):
+        n_cols = len(color_tags) * 2
+        n_rows = int(np.ceil(len(unmatched) / n_cols))
+        grid_un = np.ones((n_rows, n_cols, 3))
+        label_un = [["" for _ in range(n_cols)] for _ in range(n_rows)]
+        for idx, sw in enumerate(unmatched):
+            r, c = divmod(idx, n_cols)
+            grid_un[r, c] = store.rgb[sw]
+            label_un[r][c] = labels[sw]
+
+    figsize = (len(color_tags) * 1.5, max(len(saturation_tags) * 1.2 + n_rows * 1.2, 4))
+    height_ratios = [len(saturation_tags), n_rows / 2 if n_rows else 0.5]
+    return PaintKitLayout(list(color_tags), list(saturation_tags), grid, label_rows,
+                          grid_un, label_un, figsize, height_ratios)
+
+
+def _label_cells(ax, grid, labels, fontsize):
+    for i, row in enumerate(labels):
+        for j, text in enumerate(row):
+            if text:
+                r, g, b = grid[i][j]
+                brightness = 0.299 * r + 0.587 * g + 0.114 * b
+                text_color = "black" if brightness > 0.6 else "white"
+                ax.text(j, i, text, ha="center", va="center",
+                        color=text_color, fontsize=fontsize, fontweight="bold")
+
+
+def draw_paintkit(fig, layout):
+    """Draw a ``paintkit_layout`` onto a Figure or SubFigure."""
+    ax_grid, ax_unmatched = fig.subplots(2, 1, height_ratios=layout.height_ratios)
+
+    # --- Main Grid Plot ---
+    ax_grid.imshow(layout.grid, aspect="equal")
+    _label_cells(ax_grid, layout.grid, layout.labels, fontsize=7)
+    ax_grid.set_xticks(range(len(layout.color_tags)))
+    ax_grid.set_xticklabels(layout.color_tags, fontsize=10, rotation=45, ha="right")
+    ax_grid.set_yticks(range(len(layout.saturation_tags)))
+    ax_grid.set_yticklabels(layout.saturation_tags, fontsize=10)
+    ax_grid.set_title("Color Tag (X) vs Saturation Tag (Y)", fontsize=12)
+
+    # --- Unmatched Swatches Plot ---
+    ax_unmatched.axis("off")
+    if layout.unmatched_grid is not None:
+        ax_unmatched.imshow(layout.unmatched_grid, aspect="equal")
+        _label_cells(ax_unmatched, layout.unmatched_grid, layout.unmatched_labels, fontsize=6)
+        ax_unmatched.set_title("Unmatched Swatches", fontsize=12)
+    return ax_grid, ax_unmatched
+
+
+def render_paintkit(kit, color_tags=None, saturation_tags=None, label="hex", format="png",
+                    dpi=100):
+    """Render ``kit.display_paintkit(...)`` headlessly and return the encoded bytes."""
+    layout = paintkit_layout(kit, color_tags, saturation_tags, label)
+    fig = new_figure(layout.figsize, layout="constrained")
+    draw_paintkit(fig, layout)
+    return figure_bytes(fig, format=format, dpi=dpi)
+
+
+# --- Colormaps and sheets ---
+def render_colormap(cmap, name=None, height=0.5, format="png", dpi=100):
+    """Render the ``show_colormap`` gradient bar headlessly and return the encoded bytes."""
+    gradient = np.linspace(0, 1, 256).reshape(1, -1)
+    fig = new_figure((6, height))
+    ax = fig.add_subplot()
+    ax.imshow(gradient, aspect="auto", cmap=cmap)
+    ax.set_axis_off()
+    if name:
+        ax.set_title(name, fontsize=10)
+    return figure_bytes(fig, format=format, dpi=dpi)
+
+
+def _strip(item, resolution):
+    """(resolution, 3) RGB strip for a PaintKit, colormap or sequence of colors."""
+    positions = (np.arange(resolution) + 0.5) / resolution
+    if isinstance(item, Colormap):
+        return item(positions)[:, :3]
+    rgb = item.rgb if hasattr(item, "rgb") else to_rgba_array(list(item))[:, :3]
+    if not len(rgb):
+        return np.ones((resolution, 3))
+    return rgb[(positions * len(rgb)).astype(np.intp)]
+
+
+def sheet_image(palettes, resolution=512):
+    """Compose palettes into an (n_palettes, resolution, 3) image, one strip per row.
+
+    Returns:
+        (names, image).
+    """
+    if isinstance(palettes, dict):
+        items = list(palettes.items())
+    else:
+        items = [(str(i), item) for i, item in enumerate(palettes)]
+    image = np.ones((len(items), resolution, 3))
+    for row, (_, item) in enumerate(items):
+        image[row] = _strip(item, resolution)
+    return [name for name, _ in items], image
+
+
+def render_sheet(palettes, format="png", dpi=100, width=6.0, row_height=0.3, resolution=512):
+    """Render many palettes into one sheet and return the encoded bytes.
+
+    Args:
+        palettes: Dict of name -> PaintKit / colormap / list of colors, or a sequence
+            of them (labelled by position). Each becomes one horizontal strip; the
+            swatches of a palette share the strip's width equally.
+        format: Output format, e.g. ``"png"`` or ``"svg"``.
+        dpi: Output resolution.
+        width: Figure width in inches.
+        row_height: Height of each strip in inches.
+        resolution: Horizontal samples per strip.
+    """
+    names, image = sheet_image(palettes, resolution)
+    fig = new_figure((width, max(row_height * len(names), row_height) + 0.2),
+                     layout="constrained")
+    ax = fig.add_subplot()
+    ax.imshow(image, aspect="auto", interpolation="nearest")
+    ax.set_yticks(range(len(names)), names, fontsize=8)
+    ax.set_xticks([])
+    ax.tick_params(left=False)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    return figure_bytes(fig, format=format, dpi=dpi)
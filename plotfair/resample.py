@@ -0,0 +1,131 @@
+"""
+plotfair.resample
+Zoom-aware resampling of long line traces in Jupyter.
+
+A statically decimated trace (see ``plotfair.downsample``) turns coarse when zoomed in.
+In resampling mode the full-resolution series stay in the kernel and the figure is
+shown as a ``go.FigureWidget``. On every zoom, pan or autoscale of the x-axis, each
+registered trace is re-decimated to the visible x-range only, so the browser always
+receives about ``max_points`` points per trace.
+
+- ``SortedSeries`` sorts x once (if needed) and slices the visible range with
+  ``np.searchsorted``, so a zoom costs O(log n) plus the decimation of the slice.
+- ``attach`` registers the relayout callback on a figure; ``resampling_widget`` builds
+  the FigureWidget. Callbacks run in the local kernel; the widget's JavaScript ships
+  with plotly, so no network access is needed.
+
+``FigureWidget`` needs ``anywidget`` (``pip install plotfair[widget]``).
+"""
+
+import numpy as np
+
+from . import downsample
+
+
+class SortedSeries:
+    """Full-resolution (x, y) series with x sorted once for range slicing.
+
+    Args:
+        x, y: The series. Unsorted x is sorted with a stable argsort on construction.
+        max_points: Points sent to the browser per view (default:
+            ``downsample.MAX_POINTS``).
+        method: Decimation method, ``"minmax"`` or ``"lttb"``.
+    """
+
+    def __init__(self, x, y, max_points=None, method="minmax"):
+        x, y = np.asarray(x), np.asarray(y)
+        assert len(x) == len(y), "x and y must have the same length"
+        # Categorical and string x can't be sliced by an x-range
+        self.numeric = x.dtype.kind in "biufmM"
+        if self.numeric and len(x) > 1 and not np.all(x[1:] >= x[:-1]):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+        self.x, self.y = x, y
+        self.max_points = downsample.MAX_POINTS if max_points is None else max_points
+        self.method = method
+        self._overview = None
+
+    def __len__(self):
+        return len(self.x)
+
+    def visible(self, x0=None, x1=None):
+        """Slice bounds (lo, hi) of the points in [x0, x1], plus one neighbour each side.
+
+        The neighbours keep the line running to the edges of the view.
+        """
+        lo = 0 if x0 is None else max(int(np.searchsorted(self.x, x0, "left")) - 1, 0)
+        hi = len(self.x) if x1 is None else min(
+            int(np.searchsorted(self.x, x1, "right")) + 1, len(self.x))
+        return lo, hi
+
+    def window(self, x0=None, x1=None):
+        """The decimated (x, y) arrays to display for the x-range [x0, x1]."""
+        if x0 is None and x1 is None:
+            # Every autoscale shows the whole series; decimate it only once
+            if self._overview is None:
+                self._overview = self._decimate(self.x, self.y)
+            return self._overview
+        lo, hi = self.visible(x0, x1)
+        return self._decimate(self.x[lo:hi], self.y[lo:hi])
+
+    def _decimate(self, x, y):
+        idx = downsample.decimate_indices(x, y, self.max_points, self.method)
+        return x[idx], y[idx]
+
+    def convert(self, value, log=False):
+        """Convert an x-axis range value sent by Plotly to the dtype of x."""
+        if value is None:
+            return None
+        if self.x.dtype.kind == "M":
+            return np.datetime64(str(value).replace(" ", "T")).astype(self.x.dtype)
+        value = float(value)
+        return 10 ** value if log else value
+
+
+def attach(fig, series):
+    """Re-decimate ``series`` (trace index -> SortedSeries) whenever the x-range changes.
+
+    Works with any Plotly figure that receives relayout events, in practice a
+    ``go.FigureWidget``. Series with non-numeric x (categories, strings) are left as
+    they are, and so is a series whenever the new range can't be converted to its x.
+    Returns ``fig``.
+    """
+    series = {index: full for index, full in series.items() if full.numeric}
+    last = {"range": None, "autorange": None}
+
+    def update(layout, x_range, autorange):
+        x_range = tuple(x_range) if x_range else None
+        # A double-click turns autorange on. A zoom only sends the new range, so the
+        # kernel-side autorange flag is switched off below to catch the next double-click
+        reset = bool(autorange) and autorange != last["autorange"]
+        zoomed = not reset and x_range is not None and x_range != last["range"]
+        last.update(range=x_range, autorange=autorange)
+        if not (reset or zoomed):
+            return
+        log = layout.xaxis.type == "log"
+        windows = {}
+        for index, full in series.items():
+            if reset:
+                windows[index] = full.window()
+                continue
+            try:
+                bounds = [full.convert(v, log) for v in x_range]
+            except (TypeError, ValueError):
+                # e.g. a category or string range for a numeric series
+                continue
+            windows[index] = full.window(*bounds)
+        with fig.batch_update():
+            for index, (x, y) in windows.items():
+                fig.data[index].x, fig.data[index].y = x, y
+            if zoomed and autorange:
+                last["autorange"] = False
+                layout.xaxis.autorange = False
+
+    fig.layout.on_change(update, "xaxis.range", "xaxis.autorange")
+    return fig
+
+
+def resampling_widget(fig, series):
+    """A ``go.FigureWidget`` copy of ``fig`` whose ``series`` are resampled on zoom."""
+    import plotly.graph_objects as go
+    return attach(go.FigureWidget(fig), series)
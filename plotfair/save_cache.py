@@ -0,0 +1,333 @@
+"""
+plotfair.save_cache
+Content-addressed save cache: skip re-rendering figures whose content is unchanged.
+
+With the cache enabled (``presets.SAVE_CACHE = True`` / ``interplot_presets.SAVE_CACHE =
+True``, or ``cache=True`` per call), every save first computes a fingerprint of the
+figure: a SHA-256 over the data and visual properties of all its artists, the savefig
+rcParams and the save arguments. Each output folder keeps a manifest
+(``.plotfair-manifest.json``) mapping filenames to the fingerprint they were rendered
+from. If the fingerprint matches and the file is still the one that was written (same
+size and modification time), the render is skipped. Manifest updates are serialized
+with an OS file lock (``.plotfair-manifest.json.lock``), so concurrent processes
+saving into the same folder don't lose each other's entries.
+
+The fingerprint reflects the figure's state at save time. Transforms, renderer caches
+and other objects whose identity changes between runs are left out, so rebuilding the
+same figure in a new process gives the same fingerprint.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import warnings
+from contextlib import contextmanager
+from concurrent.futures import Future
+
+import numpy as np
+
+MANIFEST_NAME = ".plotfair-manifest.json"
+_VERSION = 1
+
+# Getter-backed properties that are not part of the rendered content, or hold objects
+# (figures, transforms, renderers) whose values differ between otherwise equal figures
+_SKIPPED_PROPERTIES = frozenset({
+    "agg_filter", "animated", "axes", "canvas", "children", "clip_box", "clip_path",
+    "cursor_data", "figure", "gid", "layout_engine", "mouseover",
+    "navigate", "navigate_mode", "path_effects", "picker", "sketch_params",
+    "tightbbox", "transform", "transformed_clip_path_and_affine", "url",
+    "window_extent",
+})
+
+# Properties of tick artists and axis offset texts that are set when a figure is drawn
+_DRAWN_PROPERTIES = frozenset({"data", "position", "text", "xdata", "ydata"})
+# Geometry of the artists inside a legend, computed by the legend layout
+_LEGEND_LAYOUT_PROPERTIES = frozenset({"height", "mutation_scale", "offset", "width", "x", "y"})
+
+_manifest_lock = threading.Lock()
+
+
+# --- Fingerprints ---
+@functools.lru_cache(maxsize=None)
+def _property_names(cls):
+    """Names of the settable properties of an Artist class that also have a getter."""
+    from matplotlib.artist import ArtistInspector
+    names = ArtistInspector(cls).get_setters()
+    return tuple(sorted(n for n in names
+                        if n not in _SKIPPED_PROPERTIES and hasattr(cls, f"get_{n}")))
+
+
+def _feed(h, value, depth=0):
+    """Hash a property value; objects without a stable value contribute their type only."""
+    from matplotlib.colors import Colormap, Normalize
+    from matplotlib.markers import MarkerStyle
+    from matplotlib.path import Path
+    from matplotlib.transforms import BboxBase
+
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, bytes):
+        h.update(value)
+    elif isinstance(value, np.ndarray):
+        array = np.ma.getdata(value)
+        h.update(f"{array.dtype.str}{array.shape};".encode())
+        if array.dtype.kind == "O":
+            for item in array.ravel():
+                _feed(h, item, depth + 1)
+        else:
+            h.update(np.ascontiguousarray(array).tobytes())
+        if np.ma.isMaskedArray(value):
+            h.update(np.ma.getmaskarray(value).tobytes())
+    elif isinstance(value, (list, tuple)) and depth < 4:
+        h.update(f"seq{len(value)}[".encode())
+        for item in value:
+            _feed(h, item, depth + 1)
+        h.update(b"]")
+    elif isinstance(value, dict) and depth < 4:
+        for key in sorted(value, key=str):
+            h.update(f"{key}=".encode())
+            _feed(h, value[key], depth + 1)
+    elif isinstance(value, Path):
+        _feed(h, value.vertices, depth + 1)
+        _feed(h, value.codes, depth + 1)
+    elif isinstance(value, BboxBase):
+        _feed(h, value.get_points(), depth + 1)
+    elif isinstance(value, Colormap):
+        _feed(h, value.name)
+        _feed(h, value(np.linspace(0.0, 1.0, 64)))
+    elif isinstance(value, Normalize):
+        _feed(h, (type(value).__name__, value.vmin, value.vmax))
+    elif isinstance(value, MarkerStyle):
+        _feed(h, (str(value.get_marker()), value.get_fillstyle()))
+    else:
+        h.update(f"<{type(value).__name__}>".encode())
+
+
+def _savefig_rc():
+    import matplotlib as mpl
+    return {key: mpl.rcParams[key] for key in sorted(mpl.rcParams) if key.startswith("savefig.")}
+
+
+def _feed_artist(h, artist, skip):
+    cls = type(artist)
+    h.update(f"<{cls.__module__}.{cls.__qualname__}>".encode())
+    for name in _property_names(cls):
+        if name in skip:
+            continue
+        try:
+            value = getattr(artist, f"get_{name}")()
+        except Exception:
+            continue
+        h.update(f"{name}=".encode())
+        _feed(h, value)
+
+
+def _walk(h, artist, skip=frozenset()):
+    """Hash an artist tree in child order.
+
+    Tick positions and labels are only written into the tick artists when the figure
+    is drawn. For each Axis, the ticks a draw would produce are hashed from its locators
+    and formatters instead; other draw-time state (automatic label and title positions,
+    layout-engine and aspect-adjusted axes positions, legend layout, mapped colors) is
+    left out or brought up to date, so the fingerprint is the same before and after a
+    draw.
+    """
+    from matplotlib.axes import Axes
+    from matplotlib.axis import Axis, Tick
+    from matplotlib.collections import Collection
+    from matplotlib.legend import Legend
+
+    if isinstance(artist, Collection):
+        artist.update_scalarmappable()
+    if isinstance(artist, Axes):
+        # The active position is adjusted for the aspect ratio during a draw, and the
+        # tick locators depend on it; apply the aspect now as the draw would
+        if artist.get_axes_locator() is None:
+            artist.apply_aspect()
+        if "position" not in skip:
+            _feed(h, artist.get_position(original=True))
+        _feed_artist(h, artist, skip | {"position"})
+    elif isinstance(artist, Legend):
+        # get_bbox_to_anchor is in display space, which moves with the parent's position;
+        # hash it relative to the parent instead, rounded to absorb the round trip
+        parent = artist.parent
+        to_parent = (parent.transAxes if isinstance(parent, Axes) else parent.transSubfigure)
+        anchor = artist.get_bbox_to_anchor().transformed(to_parent.inverted())
+        _feed(h, np.round(anchor.get_points(), 9))
+        _feed_artist(h, artist, skip | {"bbox_to_anchor"})
+    else:
+        _feed_artist(h, artist, skip)
+    if isinstance(artist, Axis):
+        children = []
+        for level, get_ticks in ((artist.major, artist.get_major_ticks),
+                                 (artist.minor, artist.get_minor_ticks)):
+            locs = level.locator()
+            _feed(h, (locs, level.formatter.format_ticks(locs), level.formatter.get_offset()))
+            children += get_ticks(len(locs))
+        children += [child for child in artist.get_children() if not isinstance(child, Tick)]
+    else:
+        children = artist.get_children()
+    drawn = _drawn_properties(artist)
+    if isinstance(artist, Legend):
+        # The legend box is laid out during a draw, from the legend's own settings
+        skip = skip | _LEGEND_LAYOUT_PROPERTIES
+    for child in children:
+        if isinstance(child, Tick):
+            _walk(h, child, _DRAWN_PROPERTIES)
+        else:
+            _walk(h, child, skip | drawn.get(id(child), frozenset()))
+
+
+def _drawn_properties(artist):
+    """id(child) -> properties of the child that a draw sets unless the user has set them."""
+    from matplotlib.axes import Axes
+    from matplotlib.axis import Axis
+    from matplotlib.figure import FigureBase
+    from matplotlib.text import Text
+
+    position = frozenset({"position"})
+    if isinstance(artist, Axis):
+        drawn = {id(artist.offsetText): _DRAWN_PROPERTIES}
+        if getattr(artist, "_autolabelpos", True):
+            drawn[id(artist.label)] = position
+        return drawn
+    if isinstance(artist, Axes):
+        drawn = {id(spine): position for spine in artist.spines.values()
+                 if spine.spine_type == "colorbar"}
+        if getattr(artist, "_autotitlepos", None) is not False:
+            # The center, left and right titles share the title offset transform
+            transform = artist.title.get_transform()
+            drawn.update((id(child), position) for child in artist.get_children()
+                         if isinstance(child, Text) and child.get_transform() == transform)
+        return drawn
+    if isinstance(artist, FigureBase) and artist.get_layout_engine() is not None:
+        return {id(ax): position for ax in artist.axes}
+    return {}
+
+
+def figure_fingerprint(fig, **save_args):
+    """SHA-256 hex digest of a matplotlib figure's content plus the save arguments.
+
+    Like the first step of a draw, this applies fixed aspect ratios to the axes
+    (``Axes.apply_aspect``) and maps collection data to colors
+    (``update_scalarmappable``) on the live figure. Both are draw-time state that the
+    next draw or save would set the same way; nothing else is modified.
+    """
+    import matplotlib as mpl
+    h = hashlib.sha256(f"plotfair-fig-{_VERSION}-{mpl.__version__};".encode())
+    _feed(h, save_args)
+    _feed(h, _savefig_rc())
+    engine = fig.get_layout_engine()
+    _feed(h, (type(engine).__name__, engine.get() if engine is not None else None))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        _walk(h, fig)
+    return h.hexdigest()
+
+
+def plotly_fingerprint(fig, **save_args):
+    """SHA-256 hex digest of a Plotly figure's JSON plus the save arguments."""
+    h = hashlib.sha256(f"plotfair-plotly-{_VERSION};".encode())
+    _feed(h, save_args)
+    # Updating a layout property can move its key; hash the JSON with sorted keys
+    h.update(json.dumps(json.loads(fig.to_json()), sort_keys=True).encode())
+    return h.hexdigest()
+
+
+# --- Manifest ---
+def _manifest_path(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), MANIFEST_NAME)
+
+
+def _read_manifest(manifest):
+    try:
+        with open(manifest, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_fresh(path, fingerprint):
+    """True if ``path`` was written by plotfair from a figure with ``fingerprint``."""
+    entry = _read_manifest(_manifest_path(path)).get(os.path.basename(path))
+    if not entry or entry.get("fingerprint") != fingerprint:
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns
+
+
+@contextmanager
+def _locked(manifest):
+    """Hold an OS-level lock on ``manifest`` across threads and processes.
+
+    Other processes (export or save workers, parallel runs) may update the same
+    manifest; the lock file keeps their read-modify-write cycles from dropping each
+    other's entries. Without a lock file (read-only folder) the manifest can't be
+    written either, so the caller just proceeds.
+    """
+    with _manifest_lock:
+        try:
+            fd = os.open(f"{manifest}.lock", os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError:
+            yield
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield  # closing the descriptor releases the lock
+        finally:
+            os.close(fd)
+
+
+def record(path, fingerprint):
+    """Store the fingerprint of a freshly written ``path`` in its folder's manifest."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+    manifest = _manifest_path(path)
+    with _locked(manifest):
+        entries = _read_manifest(manifest)
+        entries[os.path.basename(path)] = {
+            "fingerprint": fingerprint, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+        }
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(manifest), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=1, sort_keys=True)
+            os.replace(tmp, manifest)
+        except OSError:
+            pass
+
+
+def record_when_done(path, fingerprint, result):
+    """``record`` now, or once ``result`` finishes if it is a background-save Future."""
+    if isinstance(result, Future):
+        def done(future):
+            if future.exception() is None:
+                record(path, fingerprint)
+        result.add_done_callback(done)
+    else:
+        record(path, fingerprint)
+    return result
+
+
+def completed(value):
+    """A finished Future holding ``value``, returned for skipped background saves."""
+    future = Future()
+    future.set_result(value)
+    return future
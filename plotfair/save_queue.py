@@ -0,0 +1,201 @@
+"""
+plotfair.save_queue
+Non-blocking figure saving through a bounded background queue.
+
+``savefig(fig, path)`` (and ``plt.savefig(..., background=True)`` /
+``Plot.save(..., background=True)`` with the presets active) takes a frozen copy of
+the figure, hands it to a background worker and returns a ``concurrent.futures.Future``
+for the saved path. The caller can keep modifying or closing the original figure.
+
+- The copy is a pickle of the figure, so later changes to the figure don't leak
+  into the saved file. The rcParams-dependent savefig settings (dpi, bbox, ...) are
+  resolved when the save is submitted.
+- Workers are threads by default; ``configure(kind="process")`` uses worker processes
+  with the plotfair presets applied (see ``plotfair.export``).
+- At most ``max_pending`` saves are queued or running. Further submissions block
+  (backpressure), or raise ``queue.Full`` with ``block=False`` or after ``timeout``.
+- ``flush()`` / ``wait_all()`` wait until everything submitted so far is written.
+"""
+
+import copyreg
+import io
+import pickle
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from . import export
+
+# savefig keyword -> rcParam it defaults to, resolved when a save is submitted
+_SAVEFIG_RC = {
+    "dpi": "savefig.dpi",
+    "bbox_inches": "savefig.bbox",
+    "pad_inches": "savefig.pad_inches",
+    "facecolor": "savefig.facecolor",
+    "edgecolor": "savefig.edgecolor",
+}
+
+
+# --- Frozen figure copies ---
+class _FigurePickler(pickle.Pickler):
+    """Pickles a figure without its pyplot registration.
+
+    An unpickled pyplot figure normally re-registers itself with pyplot; copies made
+    for a background save must stay detached.
+    """
+
+    def __init__(self, file, fig):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._fig = fig
+
+    def reducer_override(self, obj):
+        if obj is self._fig:
+            state = obj.__getstate__()
+            state.pop("_restore_to_pylab", None)
+            return copyreg.__newobj__, (type(obj),), state
+        return NotImplemented
+
+
+def freeze_figure(fig):
+    """Serialize a matplotlib figure into a detached, immutable snapshot (bytes)."""
+    buf = io.BytesIO()
+    _FigurePickler(buf, fig).dump(fig)
+    return buf.getvalue()
+
+
+def thaw_figure(payload):
+    """Rebuild a figure from ``freeze_figure`` bytes; it is not registered with pyplot."""
+    return pickle.loads(payload)
+
+
+def _save_frozen(payload, path, savefig_kwargs):
+    return export.save_atomic(thaw_figure(payload), path, **savefig_kwargs)
+
+
+# --- Saver ---
+class BackgroundSaver:
+    """Bounded pool of background workers that write figures.
+
+    Args:
+        workers: Number of worker threads or processes.
+        max_pending: Maximum number of saves queued or in progress.
+        kind: ``"thread"`` or ``"process"``.
+        block: Wait for a free slot when the queue is full; False raises ``queue.Full``.
+        timeout: Maximum seconds to wait for a free slot (None waits forever).
+    """
+
+    def __init__(self, workers=1, max_pending=8, kind="thread", block=True, timeout=None):
+        if kind == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers,
+                                                thread_name_prefix="plotfair-save")
+        elif kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers,
+                                                 initializer=export._init_worker,
+                                                 initargs=(export._PRESET_BACKENDS,))
+        else:
+            raise ValueError(f"kind must be 'thread' or 'process', not {kind!r}")
+        self.kind = kind
+        self.block = block
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = set()
+
+    def submit(self, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` on a worker once a queue slot is free."""
+        acquired = (self._slots.acquire(timeout=self.timeout) if self.block
+                    else self._slots.acquire(blocking=False))
+        if not acquired:
+            raise queue.Full("Too many background saves pending")
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def savefig(self, fig, path, **savefig_kwargs):
+        """Save a snapshot of ``fig`` to ``path`` in the background.
+
+        Returns:
+            A Future resolving to the saved path (``path``, with the format's extension
+            appended if it has none) or raising the save error.
+        """
+        import matplotlib as mpl
+        if savefig_kwargs.setdefault("transparent", mpl.rcParams["savefig.transparent"]):
+            # Same rule as Figure.savefig: transparent saves drop the face and edge colors
+            savefig_kwargs.setdefault("facecolor", "none")
+            savefig_kwargs.setdefault("edgecolor", "none")
+        for key, rc in _SAVEFIG_RC.items():
+            savefig_kwargs.setdefault(key, mpl.rcParams[rc])
+        return self.submit(_save_frozen, freeze_figure(fig), path, savefig_kwargs)
+
+    def wait_all(self, timeout=None):
+        """Block until every save submitted so far has finished.
+
+        Returns:
+            The futures that finished; check ``future.exception()`` for failures.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        done, _ = wait(pending, timeout=timeout)
+        return list(done)
+
+    flush = wait_all
+
+    def shutdown(self, wait=True):
+        """Stop the workers, by default after the pending saves are written."""
+        self._executor.shutdown(wait=wait)
+
+
+_saver = None
+_saver_lock = threading.Lock()
+
+
+def get_saver():
+    """The process-wide BackgroundSaver, created with default settings on first use."""
+    global _saver
+    with _saver_lock:
+        if _saver is None:
+            _saver = BackgroundSaver()
+        return _saver
+
+
+def configure(**kwargs):
+    """Replace the process-wide saver, e.g. ``configure(workers=2, max_pending=32)``.
+
+    Saves pending in the previous saver are finished first. Accepts the arguments
+    of ``BackgroundSaver``.
+    """
+    global _saver
+    with _saver_lock:
+        previous, _saver = _saver, BackgroundSaver(**kwargs)
+    if previous is not None:
+        previous.shutdown(wait=True)
+    return _saver
+
+
+def savefig(fig, path, **savefig_kwargs):
+    """Save a snapshot of ``fig`` to ``path`` in the background; returns a Future."""
+    return get_saver().savefig(fig, path, **savefig_kwargs)
+
+
+def submit(fn, *args, **kwargs):
+    """Run a save callable on the process-wide saver; returns a Future."""
+    return get_saver().submit(fn, *args, **kwargs)
+
+
+def wait_all(timeout=None):
+    """Wait for every background save submitted so far."""
+    return [] if _saver is None else _saver.wait_all(timeout)
+
+
+flush = wait_all
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+import plotfair as pf
+
+
+def test_nearest_accepts_mixed_color_sequences():
+    idx = pf.paintkit.nearest(['#3A7BD5', '#E94E77', (0.2, 0.6, 0.3)])
+    assert idx.shape == (3,)
+    expected = [pf.paintkit.nearest(c) for c in ('#3A7BD5', '#E94E77', (0.2, 0.6, 0.3))]
+    np.testing.assert_array_equal(idx, expected)
+
+
+def test_nearest_treats_int_tuples_as_matplotlib_colors():
+    red = pf.paintkit.nearest([1.0, 0, 0])
+    assert pf.paintkit.nearest((1, 0, 0)) == red
+    assert pf.paintkit.nearest(np.array([255, 0, 0], dtype=np.uint8)) == red
+    np.testing.assert_array_equal(pf.paintkit.nearest(['#FF0000', (1, 0, 0)]), [red, red])
+
+
+def test_nearest_rejects_rgba():
+    with pytest.raises(ValueError):
+        pf.paintkit.nearest(np.ones((2, 4)))
@@ -0,0 +1,33 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from plotfair import resample
+
+
+def _attached(x, y):
+    fig = go.Figure(go.Scattergl(x=x[:100], y=y[:100]))
+    return resample.attach(fig, {0: resample.SortedSeries(x, y, max_points=100)})
+
+
+def test_zoom_resamples_numeric_x():
+    x = np.arange(50_000.0)
+    fig = _attached(x, np.sin(x / 100))
+    fig.layout.xaxis.range = [1000, 2000]
+    assert 1000 - 1 <= fig.data[0].x[0] and fig.data[0].x[-1] <= 2000 + 1
+
+
+def test_zoom_skips_categorical_x():
+    x = np.array([f"c{i}" for i in range(50_000)])
+    fig = _attached(x, np.random.default_rng(0).normal(size=len(x)))
+    before = fig.data[0].x
+    fig.layout.xaxis.range = [3.5, 200.2]
+    fig.layout.xaxis.range = ["c10", "c20"]
+    np.testing.assert_array_equal(fig.data[0].x, before)
+
+
+def test_zoom_ignores_unconvertible_range():
+    x = np.arange(50_000.0)
+    fig = _attached(x, np.cos(x / 100))
+    before = fig.data[0].x
+    fig.layout.xaxis.range = ["a", "b"]
+    np.testing.assert_array_equal(fig.data[0].x, before)